@@ -5,41 +5,67 @@ Account and Asset Curve API Routes (Cleaned)
 import asyncio
 import json
 import logging
+import re
 import threading
-import requests
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
-from openai import OpenAI
+
+import httpx
+import numpy as np
+from openai import AsyncOpenAI
 from openai import APIError as OpenAIAPIError
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from api.ws import manager as ws_manager, _send_snapshot_optimized
-from database.connection import SessionLocal
+from database.connection import get_db
 from database.models import Account, AccountAssetSnapshot, CryptoPrice, Order, Position, Trade, User
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from repositories.strategy_repo import get_strategy_by_account, upsert_strategy
 from schemas.account import StrategyConfig, StrategyConfigUpdate
 from services.ai_decision_service import _extract_text_from_message, build_chat_completion_endpoints
 from services.asset_calculator import calc_positions_value
 from services.asset_curve_calculator import invalidate_asset_curve_cache
-from services.broker_adapter import get_balance_and_positions, get_open_orders, get_closed_orders
-from services.market_data import get_kline_data
+from services.asset_snapshot_service import invalidate_active_accounts_cache
+from services.broker_adapter import get_balance_and_positions_async, get_open_orders_async
+from services.json_utils import DefaultJSONResponse
+from services.market_data import get_cached_kline_data
+from services.overview_cache import cache_overview, get_cached_overview, invalidate_account_overview, overview_generation
 from services.scheduler import reset_auto_trading_job
 from services.trading_strategy import strategy_manager
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session, selectinload
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/account", tags=["account"])
+router = APIRouter(prefix="/api/account", tags=["account"], default_response_class=DefaultJSONResponse)
 
+_TRUTHY_STRINGS = frozenset({"true", "1", "yes", "y", "on"})
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Model-name classification for the LLM connection test (matched against the lower-cased model name)
+_REASONING_MODEL_RE = re.compile(r"gpt-5|o1-|o3-|o4-")  # no temperature parameter
+_O1_SERIES_RE = re.compile(r"o1-")  # no system messages
+_NEW_MODEL_RE = re.compile(r"gpt-4o")  # max_completion_tokens instead of max_tokens
+
+# Upper bound on concurrent Binance requests when fanning out across accounts
+BROKER_FETCH_CONCURRENCY = 5
+
+# Auto trading job resets run on a single worker; requests arriving while one is queued are coalesced
+_reset_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auto_trading_reset")
+_reset_lock = threading.Lock()
+_reset_pending = False
+
+# Per-account locks so concurrent overview cache misses share one pair of Binance requests
+_overview_fetch_locks: Dict[int, asyncio.Lock] = {}
+
+# Shared pooled HTTP client for LLM connection tests so repeated tests reuse keep-alive connections
+_llm_http_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(60.0, connect=10.0),
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    # Match the OpenAI SDK's own default client, which follows redirects
+    follow_redirects=True,
+)
 
 
 def mask_api_key(key: Optional[str]) -> str:
@@ -54,13 +80,34 @@ def _normalize_bool(value, default=True) -> bool:
         return default
     if isinstance(value, bool):
         return value
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUTHY_STRINGS
     if isinstance(value, (int, float)):
         return bool(value)
-    if isinstance(value, str):
-        return value.strip().lower() in {"true", "1", "yes", "y", "on"}
     return bool(value)
 
 
+def _run_auto_trading_reset() -> None:
+    global _reset_pending
+    with _reset_lock:
+        _reset_pending = False
+    try:
+        reset_auto_trading_job()
+        logger.info("Auto trading job reset successfully after account update")
+    except Exception as e:
+        logger.warning(f"Failed to reset auto trading job: {e}")
+
+
+def _schedule_auto_trading_reset() -> None:
+    """Queue an auto trading job reset unless one is already waiting to run."""
+    global _reset_pending
+    with _reset_lock:
+        if _reset_pending:
+            return
+        _reset_pending = True
+    _reset_executor.submit(_run_auto_trading_reset)
+
+
 def _serialize_strategy(account: Account, strategy) -> StrategyConfig:
     """Convert database strategy config to API schema."""
     last_trigger = strategy.last_trigger_at
@@ -81,26 +128,92 @@ def _serialize_strategy(account: Account, strategy) -> StrategyConfig:
     )
 
 
+async def _gather_account_cash(accounts: List[Account]) -> list:
+    """Fetch Binance cash balances for several accounts concurrently.
+
+    Returns one entry per account, in order: the balance as float, or the exception raised.
+    """
+    semaphore = asyncio.Semaphore(BROKER_FETCH_CONCURRENCY)
+
+    async def fetch(account: Account) -> float:
+        async with semaphore:
+            balance, _ = await get_balance_and_positions_async(account)
+        return float(balance) if balance is not None else 0.0
+
+    return await asyncio.gather(*(fetch(account) for account in accounts), return_exceptions=True)
+
+
+async def _get_overview_data(account: Account) -> tuple:
+    """Return (balance, positions, open_orders) for an account, reusing results for a short TTL.
+
+    Concurrent cache misses for the same account share a single pair of Binance requests.
+    """
+    account_id = account.id
+    data = get_cached_overview(account_id)
+    if data is not None:
+        return data
+
+    fetch_lock = _overview_fetch_locks.setdefault(account_id, asyncio.Lock())
+    try:
+        async with fetch_lock:
+            # Another request may have filled the cache while this one waited
+            data = get_cached_overview(account_id)
+            if data is not None:
+                return data
+
+            generation = overview_generation(account_id)
+            (balance, positions), open_orders = await asyncio.gather(
+                get_balance_and_positions_async(account), get_open_orders_async(account)
+            )
+            data = (balance, positions, open_orders)
+            cache_overview(account_id, data, generation)
+            return data
+    finally:
+        # Waiters already hold a reference; drop the entry so the dict doesn't grow with every account seen
+        if not fetch_lock.locked() and _overview_fetch_locks.get(account_id) is fetch_lock:
+            del _overview_fetch_locks[account_id]
+
+
 @router.get("/list")
 async def list_all_accounts(db: Session = Depends(get_db)):
     """Get all active accounts - balances fetched from Binance in real-time"""
     try:
-        # Get account metadata from metadata database
-        accounts = db.query(Account).filter(Account.is_active == "true").all()
+        # Get account metadata from metadata database as plain rows (no ORM hydration);
+        # usernames come from the same statement via an outer join
+        accounts = (
+            db.query(
+                Account.id,
+                Account.user_id,
+                Account.name,
+                Account.account_type,
+                Account.model,
+                Account.base_url,
+                Account.api_key,
+                Account.binance_api_key,
+                Account.binance_secret_key,
+                Account.is_active,
+                Account.auto_trading_enabled,
+                User.username,
+            )
+            .outerjoin(User, User.id == Account.user_id)
+            .filter(Account.is_active == "true")
+            .all()
+        )
         logger.info(f"Found {len(accounts)} active accounts in metadata database")
 
+        # Get balances from Binance in real-time (one concurrent request per account)
+        cash_results = await _gather_account_cash(accounts)
+
         result = []
-        for account in accounts:
-            # Get balance from Binance in real-time (single API call)
-            balance, _ = get_balance_and_positions(account)
-            current_cash = float(balance) if balance is not None else 0.0
+        for account, current_cash in zip(accounts, cash_results):
+            if isinstance(current_cash, Exception):
+                raise current_cash
 
-            user = db.query(User).filter(User.id == account.user_id).first()
             result.append(
                 {
                     "id": account.id,
                     "user_id": account.user_id,
-                    "username": user.username if user else "unknown",
+                    "username": account.username or "unknown",
                     "name": account.name,
                     "account_type": account.account_type,
                     "current_cash": current_cash,
@@ -133,14 +246,11 @@ async def get_specific_account_overview(account_id: int, db: Session = Depends(g
         if not account:
             raise HTTPException(status_code=404, detail="Account not found")
 
-        # Get balance and positions from Binance in real-time (single API call)
-        balance, positions = get_balance_and_positions(account)
+        # Get balance/positions and open orders from Binance (requests run concurrently, briefly cached)
+        balance, positions, open_orders = await _get_overview_data(account)
         current_cash = float(balance) if balance is not None else 0.0
         positions_value = sum(float(pos["quantity"]) * 0.0 for pos in positions)  # Would need current price
         positions_count = len(positions)
-
-        # Get open orders from Binance in real-time
-        open_orders = get_open_orders(account)
         pending_orders = len(open_orders)
 
         result = {
@@ -182,9 +292,10 @@ async def get_account_strategy(account_id: int, db: Session = Depends(get_db)):
             tick_batch_size=1,
             enabled=(account.auto_trading_enabled == "true"),
         )
-        strategy_manager.refresh_strategies(force=True)
+        strategy_manager.update_one(account, strategy)
 
-    return _serialize_strategy(account, strategy)
+    # Already a validated StrategyConfig: render it directly instead of re-validating against response_model
+    return DefaultJSONResponse(content=_serialize_strategy(account, strategy).model_dump(mode="json"))
 
 
 @router.put("/{account_id}/strategy", response_model=StrategyConfig)
@@ -247,16 +358,16 @@ async def update_account_strategy(
         f"[STRATEGY] Strategy updated in DB: trigger_mode={strategy.trigger_mode}, interval_seconds={strategy.interval_seconds}, tick_batch_size={strategy.tick_batch_size}, enabled={strategy.enabled}"
     )
 
-    logger.info(f"[STRATEGY] Refreshing strategy manager (force=True)")
-    strategy_manager.refresh_strategies(force=True)
-
     # Refresh account to get latest auto_trading_enabled status
     db.refresh(account)
+
+    logger.info(f"[STRATEGY] Updating strategy manager state for account {account_id}")
+    strategy_manager.update_one(account, strategy)
     result = _serialize_strategy(account, strategy)
     logger.info(
         f"[STRATEGY] Returning serialized strategy: trigger_mode={result.trigger_mode}, enabled={result.enabled}"
     )
-    return result
+    return DefaultJSONResponse(content=result.model_dump(mode="json"))
 
 
 @router.get("/overview")
@@ -276,8 +387,8 @@ async def get_account_overview(db: Session = Depends(get_db)):
         logger.debug(f"[PAGE_LOAD] Found account {account.id} ({account.name}) in metadata DB")
         logger.info(f"[PAGE_LOAD] Found account {account.id} ({account.name}) in metadata DB")
 
-        # Get balance and positions from Binance in real-time (single API call)
-        balance, positions = get_balance_and_positions(account)
+        # Get balance/positions and open orders from Binance (requests run concurrently, briefly cached)
+        balance, positions, open_orders = await _get_overview_data(account)
         current_cash = float(balance) if balance is not None else 0.0
         positions_list = [
             {
@@ -288,8 +399,6 @@ async def get_account_overview(db: Session = Depends(get_db)):
             for pos in positions
         ]
 
-        # Get open orders from Binance in real-time
-        open_orders = get_open_orders(account)
         pending_orders = len(open_orders)
 
         # Calculate positions value (would need current prices for accurate calculation)
@@ -327,10 +436,8 @@ async def get_account_overview(db: Session = Depends(get_db)):
 async def create_new_account(payload: dict, db: Session = Depends(get_db)):
     """Create a new account - only stores metadata (LLM config), trading data fetched from Binance"""
     try:
-        # Get the default user (or first user)
-        user = db.query(User).filter(User.username == "default").first()
-        if not user:
-            user = db.query(User).first()
+        # Get the default user (or first user) in a single query
+        user = db.query(User).order_by(User.username != "default", User.id).first()
 
         if not user:
             raise HTTPException(status_code=404, detail="No user found")
@@ -344,7 +451,7 @@ async def create_new_account(payload: dict, db: Session = Depends(get_db)):
         auto_trading_enabled = _normalize_bool(payload.get("auto_trading_enabled", True))
         auto_trading_value = "true" if auto_trading_enabled else "false"
 
-        new_account = Account(
+        account_fields = dict(
             user_id=user.id,
             version="v1",
             name=payload["name"],
@@ -357,32 +464,35 @@ async def create_new_account(payload: dict, db: Session = Depends(get_db)):
             is_active="true",
             auto_trading_enabled=auto_trading_value,
         )
+        username = user.username
 
-        db.add(new_account)
+        # INSERT ... RETURNING hands back the new id without a follow-up SELECT
+        account_id = db.execute(insert(Account).values(**account_fields).returning(Account.id)).scalar_one()
         db.commit()
-        db.refresh(new_account)
+        invalidate_active_accounts_cache()
 
-        logger.info(f"Created account {new_account.id} ({new_account.name}) in metadata database")
+        logger.info(f"Created account {account_id} ({account_fields['name']}) in metadata database")
 
         return {
-            "id": new_account.id,
-            "user_id": new_account.user_id,
-            "username": user.username,
-            "name": new_account.name,
-            "account_type": new_account.account_type,
+            "id": account_id,
+            "user_id": account_fields["user_id"],
+            "username": username,
+            "name": account_fields["name"],
+            "account_type": account_fields["account_type"],
             "current_cash": 0.0,  # Will be fetched from Binance in real-time
             "frozen_cash": 0.0,
-            "model": new_account.model,
-            "base_url": new_account.base_url,
-            "api_key": mask_api_key(new_account.api_key),
-            "binance_api_key": mask_api_key(new_account.binance_api_key),
-            "binance_secret_key": mask_api_key(new_account.binance_secret_key),
-            "is_active": new_account.is_active == "true",
-            "auto_trading_enabled": new_account.auto_trading_enabled == "true",
+            "model": account_fields["model"],
+            "base_url": account_fields["base_url"],
+            "api_key": mask_api_key(account_fields["api_key"]),
+            "binance_api_key": mask_api_key(account_fields["binance_api_key"]),
+            "binance_secret_key": mask_api_key(account_fields["binance_secret_key"]),
+            "is_active": True,
+            "auto_trading_enabled": auto_trading_enabled,
         }
     except HTTPException:
         raise
     except Exception as e:
+        db.rollback()
         logger.error(f"Failed to create account: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create account: {str(e)}")
 
@@ -413,10 +523,17 @@ async def update_account_settings(account_id: int, payload: dict, db: Session =
     try:
         logger.info(f"Updating account {account_id} with payload: {payload}")
 
-        account = db.query(Account).filter(Account.id == account_id, Account.is_active == "true").first()
+        account = (
+            db.query(Account)
+            .options(selectinload(Account.user))
+            .filter(Account.id == account_id, Account.is_active == "true")
+            .first()
+        )
 
         if not account:
             raise HTTPException(status_code=404, detail="Account not found")
+        # Capture before commit expires the loaded relationship
+        username = account.user.username if account.user else "unknown"
 
         # Update fields if provided (allow empty strings for api_key and base_url)
         if "name" in payload:
@@ -467,31 +584,22 @@ async def update_account_settings(account_id: int, payload: dict, db: Session =
 
         db.commit()
         db.refresh(account)
+        invalidate_account_overview(account_id)
+        invalidate_active_accounts_cache()
         logger.info(f"Account {account_id} updated successfully")
 
-        # Reset auto trading job after account update (async in background to avoid blocking response)
-        def reset_job_async():
-            try:
-                reset_auto_trading_job()
-                logger.info("Auto trading job reset successfully after account update")
-            except Exception as e:
-                logger.warning(f"Failed to reset auto trading job: {e}")
-
-        # Run reset in background thread to not block API response
-        reset_thread = threading.Thread(target=reset_job_async, daemon=True)
-        reset_thread.start()
+        # Reset auto trading job after account update (in background to avoid blocking response)
+        _schedule_auto_trading_reset()
         logger.info("Auto trading job reset initiated in background")
 
-        user = db.query(User).filter(User.id == account.user_id).first()
-
         # Get balance from Binance in real-time (for response)
-        balance, _ = get_balance_and_positions(account)
+        balance, _ = await get_balance_and_positions_async(account)
         current_cash = float(balance) if balance is not None else 0.0
 
         return {
             "id": account.id,
             "user_id": account.user_id,
-            "username": user.username if user else "unknown",
+            "username": username,
             "name": account.name,
             "account_type": account.account_type,
             "current_cash": current_cash,  # From Binance in real-time
@@ -511,12 +619,126 @@ async def update_account_settings(account_id: int, payload: dict, db: Session =
         raise HTTPException(status_code=500, detail=f"Failed to update account: {str(e)}")
 
 
+def _build_close_matrix(symbol_klines: dict, symbol_keys: list, num_points: int) -> np.ndarray:
+    """Close prices as a (timestamps, symbols) matrix aligned with the bars; missing or empty closes become 0."""
+    matrix = np.zeros((num_points, len(symbol_keys)), dtype=np.float64)
+    for col, key in enumerate(symbol_keys):
+        closes = [float(k["close"] or 0.0) for k in symbol_klines[key][:num_points]]
+        matrix[: len(closes), col] = closes
+    return matrix
+
+
+def _replay_trades(trades: list, timestamps: np.ndarray, symbol_index: dict, close_matrix: np.ndarray):
+    """Replay trades against bar timestamps with cumulative sums instead of per-bar loops.
+
+    Returns (cash_change, positions_value) arrays with one entry per timestamp.
+    """
+    # One pass over the rows: each numeric field is converted exactly once
+    records = np.array(
+        [
+            (
+                (t.trade_time if t.trade_time.tzinfo else t.trade_time.replace(tzinfo=timezone.utc)).timestamp(),
+                t.side == "BUY",
+                float(t.quantity),
+                float(t.price),
+                float(t.commission),
+                symbol_index.get((t.symbol, t.market), -1),
+            )
+            for t in trades
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 6)
+
+    # Rows come back ORDER BY trade_time, so only re-sort if that ever stops holding
+    if records.shape[0] > 1 and not np.all(records[1:, 0] >= records[:-1, 0]):
+        records = records[np.argsort(records[:, 0], kind="stable")]
+
+    # Trades after the last bar never affect the curve
+    if timestamps.size:
+        records = records[: np.searchsorted(records[:, 0], timestamps[-1], side="right")]
+    if records.shape[0] == 0 or timestamps.size == 0:
+        zeros = np.zeros(timestamps.shape[0], dtype=np.float64)
+        return zeros, zeros.copy()
+
+    trade_ts = records[:, 0]
+    is_buy = records[:, 1].astype(bool)
+    quantity = records[:, 2]
+    notional = records[:, 3] * quantity
+    commission = records[:, 4]
+    columns = records[:, 5].astype(np.intp)
+
+    # Running totals after each trade: buys spend cash, sells receive it, commission is always paid
+    cum_cash = np.cumsum(np.where(is_buy, -notional, notional) - commission)
+
+    # Quantities only for the symbols this account traded: (trades, traded symbols)
+    known = columns >= 0
+    traded_columns, local_columns = np.unique(columns[known], return_inverse=True)
+    account_closes = close_matrix[:, traded_columns]
+    qty_deltas = np.zeros((len(trade_ts), traded_columns.size), dtype=np.float64)
+    qty_deltas[np.flatnonzero(known), local_columns] = np.where(is_buy, quantity, -quantity)[known]
+    cum_qty = np.cumsum(qty_deltas, axis=0)
+
+    # Index of the last trade at or before each bar (-1 when none yet)
+    last_trade = np.searchsorted(trade_ts, timestamps, side="right") - 1
+    has_trades = last_trade >= 0
+    safe_idx = np.maximum(last_trade, 0)
+
+    cash_change = np.where(has_trades, cum_cash[safe_idx], 0.0)
+    qty_at_bar = np.where(has_trades[:, None], cum_qty[safe_idx], 0.0)
+    # Only long positions are valued, matching the holdings view
+    positions_value = np.einsum("tk,tk->t", np.clip(qty_at_bar, 0.0, None), account_closes)
+    return cash_change, positions_value
+
+
+def _render_asset_curve(timestamps: list, datetime_strs: list, series: list, columnar: bool):
+    """Shape per-account (account, cash, positions_value, total_assets) series for the response.
+
+    Records format is one dict per (account, timestamp); columnar format shares the
+    timestamp axis and returns each account's values as arrays.
+    """
+    if columnar:
+        return {
+            "format": "columns",
+            "timestamps": timestamps,
+            "datetime_str": datetime_strs,
+            "accounts": [
+                {
+                    "user_id": account.user_id,
+                    "username": account.name,
+                    "total_assets": total,
+                    "cash": cash,
+                    "positions_value": value,
+                }
+                for account, cash, value, total in series
+            ],
+        }
+
+    return [
+        {
+            "timestamp": ts,
+            "datetime_str": dt_str,
+            "user_id": account.user_id,
+            "username": account.name,
+            "total_assets": total_value,
+            "cash": cash_value,
+            "positions_value": positions_value,
+        }
+        for account, cash, value, total in series
+        for ts, dt_str, cash_value, positions_value, total_value in zip(timestamps, datetime_strs, cash, value, total)
+    ]
+
+
 @router.get("/asset-curve/timeframe")
-async def get_asset_curve_by_timeframe(timeframe: str = "1d", db: Session = Depends(get_db)):
+async def get_asset_curve_by_timeframe(
+    timeframe: str = "1d",
+    response_format: str = Query("records", alias="format", pattern="^(records|columns)$"),
+    db: Session = Depends(get_db),
+):
     """Get asset curve data for all accounts within a specified timeframe (20 data points)
 
     Args:
         timeframe: Time period, options: 5m, 1h, 1d
+        format: "records" (list of per-point dicts) or "columns" (shared timestamps, per-account arrays)
     """
     try:
         # Validate timeframe
@@ -530,10 +752,12 @@ async def get_asset_curve_by_timeframe(timeframe: str = "1d", db: Session = Depe
         timeframe_map = {"5m": "5m", "1h": "1h", "1d": "1d"}
         period = timeframe_map[timeframe]
 
+        columnar = response_format == "columns"
+
         # Get all active accounts
         accounts = db.query(Account).filter(Account.is_active == "true").all()
         if not accounts:
-            return []
+            return _render_asset_curve([], [], [], columnar)
 
         # Get all unique symbols from all account positions and trades
         symbols_query = db.query(Trade.symbol, Trade.market).distinct().all()
@@ -543,39 +767,30 @@ async def get_asset_curve_by_timeframe(timeframe: str = "1d", db: Session = Depe
 
         if not unique_symbols:
             # No trades yet, return initial capital for all accounts
-            now = datetime.now()
+            now = datetime.now(timezone.utc)
+            now_ts = int(now.timestamp())
+            now_iso = now.isoformat()
             # Get balance from Binance for each account
-            result = []
-            for account in accounts:
-                try:
-                    balance, _ = get_balance_and_positions(account)
-                    current_cash = float(balance) if balance is not None else 0.0
-                except Exception:
+            series = []
+            for account, current_cash in zip(accounts, await _gather_account_cash(accounts)):
+                if isinstance(current_cash, Exception):
                     current_cash = 0.0
-
-                result.append(
-                    {
-                        "timestamp": int(now.timestamp()),
-                        "datetime_str": now.isoformat(),
-                        "user_id": account.user_id,
-                        "username": account.name,
-                        "total_assets": current_cash,
-                        "cash": current_cash,
-                        "positions_value": 0.0,
-                    }
-                )
-            return result
-
-        # Fetch kline data for all symbols (20 points)
+                series.append((account, [current_cash], [0.0], [current_cash]))
+            return _render_asset_curve([now_ts], [now_iso], series, columnar)
+
+        # Fetch kline data for all symbols (20 points); cache misses run concurrently
+        symbol_keys = list(unique_symbols)
+        kline_results = await asyncio.gather(
+            *(asyncio.to_thread(get_cached_kline_data, symbol, market, period, 20) for symbol, market in symbol_keys),
+            return_exceptions=True,
+        )
         symbol_klines = {}
-        for symbol, market in unique_symbols:
-            try:
-                klines = get_kline_data(symbol, market, period, 20)
-                if klines:
-                    symbol_klines[(symbol, market)] = klines
-                    logger.info(f"Fetched {len(klines)} klines for {symbol}.{market}")
-            except Exception as e:
-                logger.warning(f"Failed to fetch klines for {symbol}.{market}: {e}")
+        for (symbol, market), klines in zip(symbol_keys, kline_results):
+            if isinstance(klines, Exception):
+                logger.warning(f"Failed to fetch klines for {symbol}.{market}: {klines}")
+            elif klines:
+                symbol_klines[(symbol, market)] = klines
+                logger.info(f"Fetched {len(klines)} klines for {symbol}.{market}")
 
         if not symbol_klines:
             raise HTTPException(status_code=500, detail="Failed to fetch market data")
@@ -583,102 +798,61 @@ async def get_asset_curve_by_timeframe(timeframe: str = "1d", db: Session = Depe
         # Get timestamps from the first symbol's klines
         first_klines = next(iter(symbol_klines.values()))
         timestamps = [k["timestamp"] for k in first_klines]
+        datetime_strs = [k["datetime_str"] for k in first_klines]
+        bar_timestamps = np.array(timestamps, dtype=np.float64)
+
+        symbol_keys = list(symbol_klines.keys())
+        symbol_index = {key: idx for idx, key in enumerate(symbol_keys)}
+        close_matrix = _build_close_matrix(symbol_klines, symbol_keys, len(timestamps))
+
+        # Get current balance from Binance for every account up front (concurrent requests)
+        cash_results = await _gather_account_cash(accounts)
+
+        # Load trades for all accounts in one query instead of one query per account
+        trades_by_account = defaultdict(list)
+        all_trades = (
+            db.query(
+                Trade.account_id,
+                Trade.symbol,
+                Trade.market,
+                Trade.side,
+                Trade.price,
+                Trade.quantity,
+                Trade.commission,
+                Trade.trade_time,
+            )
+            .filter(Trade.account_id.in_([account.id for account in accounts]))
+            .order_by(Trade.account_id, Trade.trade_time.asc())
+            .all()
+        )
+        for trade in all_trades:
+            trades_by_account[trade.account_id].append(trade)
 
         # Calculate asset value for each account at each timestamp
-        result = []
-        for account in accounts:
+        num_points = len(timestamps)
+        series = []
+        for account, base_cash in zip(accounts, cash_results):
             account_id = account.id
+            if isinstance(base_cash, Exception):
+                base_cash = 0.0
+            current_cash = base_cash
 
-            # Get all trades for this account
-            trades = db.query(Trade).filter(Trade.account_id == account_id).order_by(Trade.trade_time.asc()).all()
-
-            # Get current balance from Binance for this account
-            try:
-                balance, _ = get_balance_and_positions(account)
-                current_cash = float(balance) if balance is not None else 0.0
-            except Exception:
-                current_cash = 0.0
+            trades = trades_by_account.get(account_id)
 
             if not trades:
                 # No trades, return current balance at all timestamps
-                for i, ts in enumerate(timestamps):
-                    result.append(
-                        {
-                            "timestamp": ts,
-                            "datetime_str": first_klines[i]["datetime_str"],
-                            "user_id": account.user_id,
-                            "username": account.name,
-                            "total_assets": current_cash,
-                            "cash": current_cash,
-                            "positions_value": 0.0,
-                        }
-                    )
+                flat_cash = [current_cash] * num_points
+                series.append((account, flat_cash, [0.0] * num_points, flat_cash))
                 continue
 
-            # Calculate holdings and cash at each timestamp
-            for i, ts in enumerate(timestamps):
-                ts_datetime = datetime.fromtimestamp(ts, tz=timezone.utc)
-
-                # Calculate cash changes up to this timestamp
-                cash_change = 0.0
-                position_quantities = {}
-
-                for trade in trades:
-                    trade_time = trade.trade_time
-                    if not trade_time.tzinfo:
-                        trade_time = trade_time.replace(tzinfo=timezone.utc)
-
-                    if trade_time <= ts_datetime:
-                        # Update cash
-                        trade_amount = float(trade.price) * float(trade.quantity) + float(trade.commission)
-                        if trade.side == "BUY":
-                            cash_change -= trade_amount
-                        else:  # SELL
-                            cash_change += trade_amount
-
-                        # Update position
-                        key = (trade.symbol, trade.market)
-                        if key not in position_quantities:
-                            position_quantities[key] = 0.0
-
-                        if trade.side == "BUY":
-                            position_quantities[key] += float(trade.quantity)
-                        else:  # SELL
-                            position_quantities[key] -= float(trade.quantity)
-
-                # Get current balance from Binance
-                try:
-                    balance, _ = get_balance_and_positions(account)
-                    base_cash = float(balance) if balance is not None else 0.0
-                except Exception:
-                    base_cash = 0.0
-                current_cash = base_cash + cash_change
-
-                # Calculate positions value using prices at this timestamp
-                positions_value = 0.0
-                for (symbol, market), quantity in position_quantities.items():
-                    if quantity > 0 and (symbol, market) in symbol_klines:
-                        klines = symbol_klines[(symbol, market)]
-                        if i < len(klines):
-                            price = klines[i]["close"]
-                            if price:
-                                positions_value += float(price) * quantity
-
-                total_assets = current_cash + positions_value
-
-                result.append(
-                    {
-                        "timestamp": ts,
-                        "datetime_str": first_klines[i]["datetime_str"],
-                        "user_id": account.user_id,
-                        "username": account.name,
-                        "total_assets": total_assets,
-                        "cash": current_cash,
-                        "positions_value": positions_value,
-                    }
-                )
+            # Calculate holdings and cash at every timestamp in one vectorized pass
+            cash_change, positions_value = _replay_trades(trades, bar_timestamps, symbol_index, close_matrix)
+            cash_series = base_cash + cash_change
+            total_series = cash_series + positions_value
 
-        return result
+            series.append((account, cash_series.tolist(), positions_value.tolist(), total_series.tolist()))
+
+        return _render_asset_curve(timestamps, datetime_strs, series, columnar)
 
     except HTTPException:
         raise
@@ -725,10 +899,10 @@ async def test_llm_connection(payload: dict):
             model_lower = model.lower()
 
             # Reasoning models that don't support temperature parameter
-            is_reasoning_model = any(x in model_lower for x in ["gpt-5", "o1-preview", "o1-mini", "o1-", "o3-", "o4-"])
+            is_reasoning_model = _REASONING_MODEL_RE.search(model_lower) is not None
 
             # o1 series specifically doesn't support system messages
-            is_o1_series = any(x in model_lower for x in ["o1-preview", "o1-mini", "o1-"])
+            is_o1_series = _O1_SERIES_RE.search(model_lower) is not None
 
             # Build messages
             if is_o1_series:
@@ -741,7 +915,7 @@ async def test_llm_connection(payload: dict):
 
             # Create OpenAI client (simple, following OpenAI SDK example)
             logger.info(f"[TEST-LLM] Creating OpenAI client with base_url: {base_url} ｜ api_key: {api_key}")
-            client = OpenAI(base_url=f"{base_url}", api_key=api_key)
+            client = AsyncOpenAI(base_url=f"{base_url}", api_key=api_key, http_client=_llm_http_client)
 
             # Prepare request parameters
             completion_kwargs = {
@@ -754,7 +928,7 @@ async def test_llm_connection(payload: dict):
                 completion_kwargs["temperature"] = 0
 
             # Use max_completion_tokens for newer models, max_tokens for older models
-            is_new_model = is_reasoning_model or any(x in model_lower for x in ["gpt-4o"])
+            is_new_model = is_reasoning_model or _NEW_MODEL_RE.search(model_lower) is not None
             if is_new_model:
                 completion_kwargs["max_completion_tokens"] = 2000
             else:
@@ -770,7 +944,7 @@ async def test_llm_connection(payload: dict):
 
             # Make the API call
             try:
-                completion = client.chat.completions.create(**completion_kwargs)
+                completion = await client.chat.completions.create(**completion_kwargs)
 
                 logger.info(f"[TEST-LLM] API call successful")
 
@@ -4,25 +4,42 @@ Provides completed trades, model chat summaries, and consolidated positions
 for showcasing multi-model trading activity on the dashboard.
 """
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from math import sqrt
-from statistics import mean, pstdev
+from statistics import mean
 from typing import Dict, List, Optional, Tuple
 
-from database.connection import SessionLocal
+import numpy as np
+
+from database.connection import ReadSessionLocal, SessionLocal
 from database.models import Account, AccountStrategyConfig, AIDecisionLog, Order, Position, Trade
-from fastapi import APIRouter, Depends, Query
-from services.asset_calculator import calc_positions_value
-from services.broker_adapter import get_balance_and_positions
-from services.market_data import get_last_price
+from fastapi import APIRouter, Depends, HTTPException, Query
+from services.broker_adapter import get_balance_and_positions, get_balance_and_positions_async
+from services.json_utils import DefaultJSONResponse
+from services.market_data import get_last_price, get_last_prices_bulk
 from services.price_cache import cache_price, get_cached_price
-from sqlalchemy import desc
+from sqlalchemy import and_, case, desc, func, or_
 from sqlalchemy.orm import Session
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/arena", tags=["arena"])
+router = APIRouter(prefix="/api/arena", tags=["arena"], default_response_class=DefaultJSONResponse)
+
+# Upper bound on worker threads computing per-account analytics concurrently
+ANALYTICS_MAX_WORKERS = 8
+
+# Only the account columns analytics and the broker read; rows expose them as attributes like an Account
+_ANALYTICS_ACCOUNT_COLUMNS = (
+    Account.id,
+    Account.name,
+    Account.model,
+    Account.binance_api_key,
+    Account.binance_secret_key,
+)
 
 
 def get_db():
@@ -49,38 +66,25 @@ def _get_latest_price(symbol: str, market: str = "CRYPTO") -> Optional[float]:
         return None
 
 
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes from the database as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
 def _analyze_balance_series(balances: List[float]) -> Tuple[float, float, List[float], float]:
     """Return biggest gain/loss deltas, percentage returns, and balance volatility."""
     if len(balances) < 2:
         return 0.0, 0.0, [], 0.0
 
-    biggest_gain = float("-inf")
-    biggest_loss = float("inf")
-    returns: List[float] = []
-
-    previous = balances[0]
-
-    for current in balances[1:]:
-        delta = current - previous
-        if delta > biggest_gain:
-            biggest_gain = delta
-        if delta < biggest_loss:
-            biggest_loss = delta
-
-        if previous not in (0, None):
-            try:
-                returns.append(delta / previous)
-            except ZeroDivisionError:
-                pass
-
-        previous = current
-
-    if biggest_gain == float("-inf"):
-        biggest_gain = 0.0
-    if biggest_loss == float("inf"):
-        biggest_loss = 0.0
+    series = np.asarray(balances, dtype=np.float64)
+    deltas = np.diff(series)
+    previous = series[:-1]
+    nonzero = previous != 0
 
-    volatility = pstdev(balances) if len(balances) > 1 else 0.0
+    biggest_gain = float(deltas.max())
+    biggest_loss = float(deltas.min())
+    returns = (deltas[nonzero] / previous[nonzero]).tolist()
+    volatility = float(series.std())
 
     return biggest_gain, biggest_loss, returns, volatility
 
@@ -90,27 +94,68 @@ def _compute_sharpe_ratio(returns: List[float]) -> Optional[float]:
     if len(returns) < 2:
         return None
 
-    avg_return = mean(returns)
-    volatility = pstdev(returns)
+    series = np.asarray(returns, dtype=np.float64)
+    volatility = float(series.std())
     if volatility == 0:
         return None
 
-    scaled_factor = sqrt(len(returns))
-    return avg_return / volatility * scaled_factor
+    scaled_factor = sqrt(series.size)
+    return float(series.mean()) / volatility * scaled_factor
+
+
+def _average_interval_minutes(times: List[Optional[datetime]]) -> Optional[float]:
+    """Average gap in minutes between consecutive timestamps, skipping gaps next to missing values."""
+    if len(times) < 2:
+        return None
+
+    gaps = np.diff(np.array(times, dtype="datetime64[us]"))
+    gaps = gaps[~np.isnat(gaps)]
+    if gaps.size == 0:
+        return None
+    return float(gaps.astype(np.float64).mean() / 60e6)
+
 
+def _aggregate_account_stats(
+    db: Session,
+    account,
+    price_memo: Optional[Dict[str, Optional[float]]] = None,
+    price_memo_lock: Optional[threading.Lock] = None,
+) -> Dict[str, Optional[float]]:
+    """Aggregate trade and decision statistics for a given account.
+
+    ``account`` is an Account or a row with the ``_ANALYTICS_ACCOUNT_COLUMNS`` attributes.
+    ``price_memo`` is an optional per-request symbol -> price dict shared across
+    accounts so a symbol held by several accounts is only priced once; pass
+    ``price_memo_lock`` when several threads share it.
+    """
+    if price_memo is None:
+        price_memo = {}
+    if price_memo_lock is None:
+        price_memo_lock = threading.Lock()
 
-def _aggregate_account_stats(db: Session, account: Account) -> Dict[str, Optional[float]]:
-    """Aggregate trade and decision statistics for a given account."""
     # Get balance and positions from Binance in real-time (single API call)
     try:
         balance, positions_data = get_balance_and_positions(account)
         current_cash = float(balance) if balance is not None else 0.0
 
+        # Price the symbols no other account has priced yet in one batch; the lock only guards the memo,
+        # never the upstream call, so workers keep fetching in parallel
+        symbols = {pos["symbol"] for pos in positions_data}
+        with price_memo_lock:
+            missing = symbols - price_memo.keys()
+        if missing:
+            fetched = get_last_prices_bulk((symbol, "CRYPTO") for symbol in missing)
+            with price_memo_lock:
+                for symbol in missing:
+                    price_memo.setdefault(symbol, fetched.get((symbol, "CRYPTO")))
+        with price_memo_lock:
+            prices = {symbol: price_memo.get(symbol) for symbol in symbols}
+
         # Calculate positions value
         positions_value = 0.0
         for pos in positions_data:
             try:
-                price = _get_latest_price(pos["symbol"], "CRYPTO")
+                price = prices.get(pos["symbol"])
                 if price:
                     positions_value += float(price) * float(pos["quantity"])
             except Exception:
@@ -140,15 +185,43 @@ def _aggregate_account_stats(db: Session, account: Account) -> Dict[str, Optiona
 
     logger.debug(f"[TOTAL_RETURN]   - total_return_pct: 0.00% (no initial capital tracked)")
 
-    trades: List[Trade] = db.query(Trade).filter(Trade.account_id == account.id).order_by(Trade.trade_time.asc()).all()
-    trade_count = len(trades)
-    total_fees = sum(float(trade.commission or 0) for trade in trades)
-    total_volume = sum(abs(float(trade.price or 0) * float(trade.quantity or 0)) for trade in trades)
-    first_trade_time = trades[0].trade_time.isoformat() if trades else None
-    last_trade_time = trades[-1].trade_time.isoformat() if trades else None
-
-    decisions: List[AIDecisionLog] = (
-        db.query(AIDecisionLog)
+    # Trade totals are aggregated in SQL rather than by loading every trade row
+    trade_count, total_fees, total_volume, first_trade_at, last_trade_at = (
+        db.query(
+            func.count(Trade.id),
+            func.coalesce(func.sum(Trade.commission), 0),
+            func.coalesce(func.sum(func.abs(Trade.price * Trade.quantity)), 0),
+            func.min(Trade.trade_time),
+            func.max(Trade.trade_time),
+        )
+        .filter(Trade.account_id == account.id)
+        .one()
+    )
+    total_fees = float(total_fees)
+    total_volume = float(total_volume)
+    first_trade_time = first_trade_at.isoformat() if first_trade_at else None
+    last_trade_time = last_trade_at.isoformat() if last_trade_at else None
+
+    # Decision counters are aggregated in SQL as well
+    decision_count, executed_decisions, avg_target_portion = (
+        db.query(
+            func.count(AIDecisionLog.id),
+            func.coalesce(func.sum(case((AIDecisionLog.executed == "true", 1), else_=0)), 0),
+            func.avg(func.coalesce(AIDecisionLog.target_portion, 0)),
+        )
+        .filter(AIDecisionLog.account_id == account.id)
+        .one()
+    )
+    executed_decisions = int(executed_decisions)
+    decision_execution_rate = executed_decisions / decision_count if decision_count else None
+    avg_target_portion = float(avg_target_portion) if decision_count else None
+
+    # Only the columns the statistics need; skips the large prompt/reasoning snapshots
+    decisions = (
+        db.query(
+            AIDecisionLog.decision_time,
+            AIDecisionLog.total_balance,
+        )
         .filter(AIDecisionLog.account_id == account.id)
         .order_by(AIDecisionLog.decision_time.asc())
         .all()
@@ -158,25 +231,13 @@ def _aggregate_account_stats(db: Session, account: Account) -> Dict[str, Optiona
     biggest_gain, biggest_loss, returns, balance_volatility = _analyze_balance_series(balances)
     sharpe_ratio = _compute_sharpe_ratio(returns)
 
-    wins = len([r for r in returns if r > 0])
-    losses = len([r for r in returns if r < 0])
+    returns_arr = np.asarray(returns, dtype=np.float64)
+    wins = int((returns_arr > 0).sum())
+    losses = int((returns_arr < 0).sum())
     win_rate = wins / len(returns) if returns else None
     loss_rate = losses / len(returns) if returns else None
 
-    executed_decisions = len([d for d in decisions if d.executed == "true"])
-    decision_execution_rate = executed_decisions / len(decisions) if decisions else None
-    avg_target_portion = mean(float(d.target_portion or 0) for d in decisions) if decisions else None
-
-    avg_decision_interval_minutes = None
-    if len(decisions) > 1:
-        intervals = []
-        previous = decisions[0].decision_time
-        for decision in decisions[1:]:
-            if decision.decision_time and previous:
-                delta = decision.decision_time - previous
-                intervals.append(delta.total_seconds() / 60.0)
-            previous = decision.decision_time
-        avg_decision_interval_minutes = mean(intervals) if intervals else None
+    avg_decision_interval_minutes = _average_interval_minutes([d.decision_time for d in decisions])
 
     return {
         "account_id": account.id,
@@ -199,7 +260,7 @@ def _aggregate_account_stats(db: Session, account: Account) -> Dict[str, Optiona
         "loss_rate": loss_rate,
         "sharpe_ratio": sharpe_ratio,
         "balance_volatility": balance_volatility,
-        "decision_count": len(decisions),
+        "decision_count": decision_count,
         "executed_decisions": executed_decisions,
         "decision_execution_rate": decision_execution_rate,
         "avg_target_portion": avg_target_portion,
@@ -207,26 +268,41 @@ def _aggregate_account_stats(db: Session, account: Account) -> Dict[str, Optiona
     }
 
 
+def _parse_trade_cursor(cursor: str) -> Tuple[str, Optional[int]]:
+    """Split a ``"<trade_time ISO>,<trade id>"`` cursor; a bare timestamp (no id) is accepted too.
+
+    The time comes back in SQLite's ``datetime()`` text form so it compares against the normalized column.
+    """
+    time_part, _, id_part = cursor.partition(",")
+    try:
+        return datetime.fromisoformat(time_part).strftime("%Y-%m-%d %H:%M:%S"), int(id_part) if id_part else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid trade cursor")
+
+
 @router.get("/trades")
 def get_completed_trades(
     limit: int = Query(100, ge=1, le=500),
     account_id: Optional[int] = None,
+    before: Optional[str] = Query(None, description="Cursor from a previous response's next_cursor"),
     db: Session = Depends(get_db),
 ):
     """Return recent trades across all AI accounts.
     Trades are stored in metadata database (completed trades are logged).
+    Pass the previous response's ``next_cursor`` as ``before`` to page further back.
     """
-    # Get account metadata from metadata database
+    # Get account metadata from metadata database (only the columns the response uses)
+    accounts_query = db.query(Account.id, Account.name, Account.model).filter(Account.is_active == "true")
     if account_id:
-        accounts = db.query(Account).filter(Account.id == account_id, Account.is_active == "true").all()
-    else:
-        accounts = db.query(Account).filter(Account.is_active == "true").all()
+        accounts_query = accounts_query.filter(Account.id == account_id)
+    accounts = accounts_query.all()
 
     if not accounts:
         return {
             "generated_at": datetime.utcnow().isoformat(),
             "accounts": [],
             "trades": [],
+            "next_cursor": None,
         }
 
     account_ids = [acc.id for acc in accounts]
@@ -235,17 +311,47 @@ def get_completed_trades(
 
     # Query trades from metadata database
     query = (
-        db.query(Trade)
+        db.query(
+            Trade.id,
+            Trade.order_id,
+            Trade.account_id,
+            Trade.symbol,
+            Trade.market,
+            Trade.side,
+            Trade.price,
+            Trade.quantity,
+            Trade.commission,
+            Trade.trade_time,
+        )
         .filter(Trade.account_id.in_(account_ids))
-        .order_by(desc(Trade.trade_time))
-        .limit(limit * 2)  # Get more, will limit later
     )
+    # server_default stores 'YYYY-MM-DD HH:MM:SS' while bound datetimes carry microseconds, so raw text
+    # comparisons miss the boundary second; page and order on the normalized value instead
+    trade_second = func.datetime(Trade.trade_time)
+    if before is not None:
+        # Keyset pagination on (trade second, id). The id tie-breaker keeps trades sharing the boundary second
+        # (one AI cycle trading several symbols) from being skipped or repeated.
+        before_time, before_id = _parse_trade_cursor(before)
+        if before_id is None:
+            query = query.filter(trade_second < before_time)
+        else:
+            query = query.filter(
+                or_(trade_second < before_time, and_(trade_second == before_time, Trade.id < before_id))
+            )
+    query = query.order_by(desc(trade_second), desc(Trade.id)).limit(limit * 2)  # Get more, will limit later
 
     trade_rows = query.all()
 
+    # Resolve accounts and order numbers up front instead of per trade row
+    account_map = {acc.id: acc for acc in accounts}
+    order_ids = {trade.order_id for trade in trade_rows if trade.order_id}
+    order_no_map = (
+        dict(db.query(Order.id, Order.order_no).filter(Order.id.in_(order_ids)).all()) if order_ids else {}
+    )
+
     for trade in trade_rows:
         # Get account info from metadata DB
-        account = next((acc for acc in accounts if acc.id == trade.account_id), None)
+        account = account_map.get(trade.account_id)
         if not account:
             continue
 
@@ -253,11 +359,7 @@ def get_completed_trades(
         price = float(trade.price)
         notional = price * quantity
 
-        order_no = None
-        if trade.order_id:
-            order = db.query(Order).filter(Order.id == trade.order_id).first()
-            if order:
-                order_no = order.order_no
+        order_no = order_no_map.get(trade.order_id) if trade.order_id else None
 
         all_trades.append(
             {
@@ -286,14 +388,18 @@ def get_completed_trades(
                 "model": account.model,
             }
 
-    # Sort all trades by time and limit
-    all_trades.sort(key=lambda x: x["trade_time"] if x["trade_time"] else "", reverse=True)
+    # Sort all trades by time to the second (then id, matching the keyset order) and limit
+    all_trades.sort(key=lambda x: ((x["trade_time"] or "")[:19], x["trade_id"]), reverse=True)
     trades = all_trades[:limit]
+    next_cursor = None
+    if len(trades) == limit and trades[-1]["trade_time"]:
+        next_cursor = f"{trades[-1]['trade_time']},{trades[-1]['trade_id']}"
 
     return {
         "generated_at": datetime.utcnow().isoformat(),
         "accounts": list(accounts_meta.values()),
         "trades": trades,
+        "next_cursor": next_cursor,
     }
 
 
@@ -301,16 +407,18 @@ def get_completed_trades(
 def get_model_chat(
     limit: int = Query(60, ge=1, le=200),
     account_id: Optional[int] = None,
+    light: bool = Query(False, description="Omit prompt/reasoning/decision snapshots"),
     db: Session = Depends(get_db),
 ):
     """Return recent AI decision logs as chat-style summaries.
     Decision logs are stored in metadata database.
+    With ``light=true`` the snapshot blobs are not loaded and are returned as null.
     """
-    # Get account metadata from metadata database
+    # Get account metadata from metadata database (only the columns the response uses)
+    accounts_query = db.query(Account.id, Account.name, Account.model).filter(Account.is_active == "true")
     if account_id:
-        accounts = db.query(Account).filter(Account.id == account_id, Account.is_active == "true").all()
-    else:
-        accounts = db.query(Account).filter(Account.is_active == "true").all()
+        accounts_query = accounts_query.filter(Account.id == account_id)
+    accounts = accounts_query.all()
 
     if not accounts:
         return {
@@ -319,11 +427,30 @@ def get_model_chat(
         }
 
     account_ids_list = [acc.id for acc in accounts]
-    all_decision_rows: List[Tuple[AIDecisionLog, Account]] = []
+    all_decision_rows: List[tuple] = []
 
     # Query decisions from metadata database
+    columns = [
+        AIDecisionLog.id,
+        AIDecisionLog.account_id,
+        AIDecisionLog.operation,
+        AIDecisionLog.symbol,
+        AIDecisionLog.reason,
+        AIDecisionLog.executed,
+        AIDecisionLog.prev_portion,
+        AIDecisionLog.target_portion,
+        AIDecisionLog.total_balance,
+        AIDecisionLog.order_id,
+        AIDecisionLog.decision_time,
+    ]
+    if not light:
+        columns += [
+            AIDecisionLog.prompt_snapshot,
+            AIDecisionLog.reasoning_snapshot,
+            AIDecisionLog.decision_snapshot,
+        ]
     query = (
-        db.query(AIDecisionLog)
+        db.query(*columns)
         .filter(AIDecisionLog.account_id.in_(account_ids_list))
         .order_by(desc(AIDecisionLog.decision_time))
         .limit(limit * 2)  # Get more, will limit later
@@ -350,37 +477,31 @@ def get_model_chat(
 
     entries: List[dict] = []
 
-    # Get strategy configs from metadata database
+    # Get strategy configs from metadata database, normalized once per account:
+    # account_id -> (trigger_mode, enabled, last_trigger_iso, last_trigger_ts)
     account_ids = {account.id for _, account in decision_rows}
-    strategy_map = {
-        cfg.account_id: cfg
-        for cfg in db.query(AccountStrategyConfig).filter(AccountStrategyConfig.account_id.in_(account_ids)).all()
-    }
+    strategy_map: Dict[int, Tuple[Optional[str], bool, Optional[str], Optional[float]]] = {}
+    for cfg_account_id, cfg_trigger_mode, cfg_enabled, cfg_last_trigger_at in db.query(
+        AccountStrategyConfig.account_id,
+        AccountStrategyConfig.trigger_mode,
+        AccountStrategyConfig.enabled,
+        AccountStrategyConfig.last_trigger_at,
+    ).filter(AccountStrategyConfig.account_id.in_(account_ids)):
+        last_iso = None
+        last_ts = None
+        if cfg_last_trigger_at:
+            last_dt = _as_utc(cfg_last_trigger_at)
+            last_iso = last_dt.isoformat()
+            last_ts = last_dt.timestamp()
+        strategy_map[cfg_account_id] = (cfg_trigger_mode, cfg_enabled == "true", last_iso, last_ts)
 
     for log, account in decision_rows:
-        strategy = strategy_map.get(account.id)
-        last_trigger_iso = None
+        trigger_mode, strategy_enabled, last_trigger_iso, last_trigger_ts = strategy_map.get(
+            account.id, (None, None, None, None)
+        )
         trigger_latency = None
-        trigger_mode = None
-        strategy_enabled = None
-
-        if strategy:
-            trigger_mode = strategy.trigger_mode
-            strategy_enabled = strategy.enabled == "true"
-            if strategy.last_trigger_at:
-                last_dt = strategy.last_trigger_at
-                if last_dt.tzinfo is None:
-                    last_dt = last_dt.replace(tzinfo=timezone.utc)
-                last_trigger_iso = last_dt.isoformat()
-
-                log_dt = log.decision_time
-                if log_dt:
-                    if log_dt.tzinfo is None:
-                        log_dt = log_dt.replace(tzinfo=timezone.utc)
-                    try:
-                        trigger_latency = abs((log_dt - last_dt).total_seconds())
-                    except Exception:
-                        trigger_latency = None
+        if last_trigger_ts is not None and log.decision_time:
+            trigger_latency = abs(_as_utc(log.decision_time).timestamp() - last_trigger_ts)
 
         entries.append(
             {
@@ -401,9 +522,9 @@ def get_model_chat(
                 "strategy_enabled": strategy_enabled,
                 "last_trigger_at": last_trigger_iso,
                 "trigger_latency_seconds": trigger_latency,
-                "prompt_snapshot": log.prompt_snapshot,
-                "reasoning_snapshot": log.reasoning_snapshot,
-                "decision_snapshot": log.decision_snapshot,
+                "prompt_snapshot": None if light else log.prompt_snapshot,
+                "reasoning_snapshot": None if light else log.reasoning_snapshot,
+                "decision_snapshot": None if light else log.decision_snapshot,
             }
         )
 
@@ -414,7 +535,7 @@ def get_model_chat(
 
 
 @router.get("/positions")
-def get_positions_snapshot(
+async def get_positions_snapshot(
     account_id: Optional[int] = None,
     db: Session = Depends(get_db),
 ):
@@ -432,17 +553,30 @@ def get_positions_snapshot(
 
     accounts = accounts_query.all()
 
+    # Get positions from Binance in real-time, all accounts concurrently
+    broker_results = await asyncio.gather(
+        *(get_balance_and_positions_async(account) for account in accounts), return_exceptions=True
+    )
+
+    # Look up every distinct symbol's price once, concurrently
+    needed_symbols = sorted(
+        {pos["symbol"] for result in broker_results if not isinstance(result, Exception) for pos in result[1]}
+    )
+    price_results = await asyncio.gather(
+        *(asyncio.to_thread(_get_latest_price, symbol, "CRYPTO") for symbol in needed_symbols)
+    )
+    latest_prices = dict(zip(needed_symbols, price_results))
+
     snapshots: List[dict] = []
 
-    for account in accounts:
-        # Get positions from Binance in real-time
-        try:
-            balance, positions_data = get_balance_and_positions(account)
-            current_cash = float(balance) if balance is not None else 0.0
-        except Exception as e:
-            logger.debug(f"Failed to fetch Binance data for account {account.id}: {e}")
+    for account, broker_result in zip(accounts, broker_results):
+        if isinstance(broker_result, Exception):
+            logger.debug(f"Failed to fetch Binance data for account {account.id}: {broker_result}")
             current_cash = 0.0
             positions_data = []
+        else:
+            balance, positions_data = broker_result
+            current_cash = float(balance) if balance is not None else 0.0
 
         position_items: List[dict] = []
         total_unrealized = 0.0
@@ -452,7 +586,7 @@ def get_positions_snapshot(
             avg_cost = float(pos["avg_cost"])
             base_notional = quantity * avg_cost
 
-            last_price = _get_latest_price(pos["symbol"], "CRYPTO")
+            last_price = latest_prices.get(pos["symbol"])
             if last_price is None:
                 last_price = avg_cost
 
@@ -511,8 +645,9 @@ def get_aggregated_analytics(
     """Return leaderboard-style analytics for AI accounts.
     Data fetched from Binance in real-time.
     """
-    # Get account metadata from metadata database
-    accounts_query = db.query(Account).filter(
+    # Get account metadata from metadata database as plain rows: worker threads must not touch ORM
+    # instances owned by this request's session
+    accounts_query = db.query(*_ANALYTICS_ACCOUNT_COLUMNS).filter(
         Account.account_type == "AI",
     )
 
@@ -541,11 +676,26 @@ def get_aggregated_analytics(
     total_fees_all = 0.0
     total_volume_all = 0.0
     sharpe_values = []
+    price_memo: Dict[str, Optional[float]] = {}
+    price_memo_lock = threading.Lock()
+
+    # Stats are calculated from Binance real-time data
+    if len(accounts) == 1:
+        analytics.append(_aggregate_account_stats(db, accounts[0], price_memo, price_memo_lock))
+    else:
+        # Each account's Binance fetch and SQL aggregates are independent; run them
+        # on worker threads, each with its own session
+        def _stats_with_own_session(account) -> Dict[str, Optional[float]]:
+            worker_db = ReadSessionLocal()
+            try:
+                return _aggregate_account_stats(worker_db, account, price_memo, price_memo_lock)
+            finally:
+                worker_db.close()
+
+        with ThreadPoolExecutor(max_workers=min(ANALYTICS_MAX_WORKERS, len(accounts))) as pool:
+            analytics.extend(pool.map(_stats_with_own_session, accounts))
 
-    for account in accounts:
-        # Stats are calculated from Binance real-time data
-        stats = _aggregate_account_stats(db, account)
-        analytics.append(stats)
+    for stats in analytics:
         total_assets_all += stats.get("total_assets") or 0.0
         total_initial += stats.get("initial_capital") or 0.0
         total_fees_all += stats.get("total_fees") or 0.0
@@ -553,10 +703,11 @@ def get_aggregated_analytics(
         if stats.get("sharpe_ratio") is not None:
             sharpe_values.append(stats["sharpe_ratio"])
 
-    analytics.sort(
-        key=lambda item: item.get("total_return_pct") if item.get("total_return_pct") is not None else float("-inf"),
-        reverse=True,
-    )
+    if len(analytics) > 1:
+        analytics.sort(
+            key=lambda item: item.get("total_return_pct") if item.get("total_return_pct") is not None else float("-inf"),
+            reverse=True,
+        )
 
     average_sharpe = mean(sharpe_values) if sharpe_values else None
     total_pnl_all = total_assets_all - total_initial
@@ -17,6 +17,7 @@ from schemas.order import OrderCreate, OrderOut
 from services.order_matching import (cancel_order, check_and_execute_order,
                                      create_order, get_pending_orders,
                                      process_all_pending_orders)
+from services.overview_cache import invalidate_account_overview
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -129,6 +130,7 @@ async def create_new_order(request: OrderCreateRequest, db: Session = Depends(ge
         )
         
         db.commit()
+        invalidate_account_overview(account.id)
         db.refresh(order)
         
         logger.info(f"User {user.username} created order: {order.order_no}")
@@ -2,14 +2,16 @@ import asyncio
 import json
 import logging
 import threading
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Dict, Optional, Set
+from typing import Dict, Iterable, Optional, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
-from database.connection import SessionLocal
+from database.connection import ReadSessionLocal, SessionLocal
 from database.models import Account, AIDecisionLog, CryptoPrice, Trade, User
 from fastapi import WebSocket, WebSocketDisconnect
 from repositories.account_repo import get_account, get_or_create_default_account
@@ -18,102 +20,439 @@ from repositories.position_repo import list_positions
 from repositories.user_repo import get_or_create_user, get_user
 from services.asset_calculator import calc_positions_value
 from services.asset_curve_calculator import get_all_asset_curves_data_new
-from services.broker_adapter import get_balance_and_positions, get_open_orders
-from services.market_data import get_last_price
+from services.broker_adapter import get_balance_and_positions_async, get_open_orders_async
+from services.json_utils import dumps_bytes as json_dumps_bytes, loads as json_loads
+from services.market_data import get_last_prices_bulk
 from services.order_matching import create_order
-from services.scheduler import add_account_snapshot_job, remove_account_snapshot_job
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.websockets import WebSocketState
+
+# Compared by identity on every send instead of looking up and comparing the state name
+_CONNECTED = WebSocketState.CONNECTED
+
+# Upper bound on a single WebSocket send so one stalled client cannot hold up its writer forever
+SEND_TIMEOUT_SECONDS = 5.0
+# Messages buffered per socket before a client is considered too slow and dropped
+OUTBOX_MAX_MESSAGES = 32
+# Upper bound on one batched frame for clients that accept length-prefixed batches
+BATCH_MAX_BYTES = 64 * 1024
+
+# Asset curves cover all accounts, so every snapshot within this window shares one computation
+ASSET_CURVE_CACHE_TTL_SECONDS = 30.0
+# One task refreshes every connected account on this cadence (30 seconds to avoid Binance API rate limits)
+SNAPSHOT_INTERVAL_SECONDS = 30
+# Upper bound on account snapshots built at once by the refresh task
+SNAPSHOT_CONCURRENCY = 16
+# Worker threads that assemble and serialize snapshot payloads off the event loop
+SNAPSHOT_BUILD_WORKERS = 4
+# Arena asset updates from price ticks within this window go out as one broadcast
+ARENA_UPDATE_COALESCE_SECONDS = 0.05
+# An unchanged account re-sends its last snapshot bytes within this window (matches the broker cache TTL)
+SNAPSHOT_REUSE_SECONDS = 5.0
+
+_snapshot_executor = ThreadPoolExecutor(max_workers=SNAPSHOT_BUILD_WORKERS, thread_name_prefix="ws-snapshot")
+
+# Newest arena asset update waiting for the coalescing flush (None when no flush is pending)
+_pending_arena_update: Optional[dict] = None
+_arena_update_lock = threading.Lock()
+
+# timeframe -> (monotonic time computed, curves)
+_asset_curve_cache: Dict[str, Tuple[float, list]] = {}
+_asset_curve_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def _safe_send(ws: WebSocket, payload: Union[str, bytes]) -> bool:
+    """Send a pre-serialized payload to one socket; returns False if the socket should be dropped.
+
+    bytes payloads go out as binary frames, str payloads as text frames.
+    """
+    try:
+        # Check if WebSocket is still open before sending
+        if ws.client_state is not _CONNECTED:
+            return False
+        send = ws.send_bytes(payload) if isinstance(payload, bytes) else ws.send_text(payload)
+        await asyncio.wait_for(send, timeout=SEND_TIMEOUT_SECONDS)
+        return True
+    except (RuntimeError, ConnectionError, WebSocketDisconnect, asyncio.TimeoutError):
+        # Connection is closed or too slow - mark for removal
+        return False
+    except Exception as e:
+        # Other unexpected errors
+        logger.warning(f"Unexpected error sending to WebSocket: {type(e).__name__}: {e}")
+        return False
+
+
+def _log_event_loop_type(loop: asyncio.AbstractEventLoop):
+    """Note which event loop serves the WebSockets; the stdlib selector loop means uvloop is not in use."""
+    loop_type = f"{type(loop).__module__}.{type(loop).__name__}"
+    if type(loop).__module__.startswith("uvloop"):
+        logger.info(f"[WS] Event loop: {loop_type}")
+    else:
+        logger.warning(
+            f"[WS] Event loop is {loop_type}, not uvloop; install uvloop (uvicorn[standard]) or run uvicorn --loop uvloop"
+        )
+
+
+def _serialize(message: dict) -> Optional[bytes]:
+    """Serialize an outbound message once to UTF-8 JSON; None (after logging) if it cannot be encoded."""
+    try:
+        return json_dumps_bytes(message)
+    except Exception as e:
+        logger.error(f"Failed to serialize WebSocket message of type {message.get('type')}: {e}")
+        return None
+
+
+def _constant_reply(message: dict) -> Tuple[bytes, str]:
+    """Encode a fixed reply once, as both the binary and the text frame payload."""
+    payload = json_dumps_bytes(message)
+    return payload, payload.decode()
+
+
+# Replies with a constant body, encoded at import instead of on every send (pings dominate idle sockets)
+PONG_REPLY = _constant_reply({"type": "pong"})
+UNKNOWN_MESSAGE_REPLY = _constant_reply({"type": "error", "message": "unknown message"})
+INVALID_JSON_REPLY = _constant_reply({"type": "error", "message": "Invalid JSON format"})
+INVALID_QUANTITY_REPLY = _constant_reply({"type": "error", "message": "invalid quantity"})
+NOT_AUTHENTICATED_REPLY = _constant_reply({"type": "error", "message": "not authenticated"})
+ACCOUNT_NOT_FOUND_REPLY = _constant_reply({"type": "error", "message": "account not found"})
+USER_NOT_FOUND_REPLY = _constant_reply({"type": "error", "message": "user not found"})
+
+
+def _diff_snapshot(previous: dict, current: dict) -> list:
+    """JSON-Patch style ops turning one snapshot into the next.
+
+    Only top-level keys (and the fields of top-level objects such as ``overview``) are compared;
+    keys missing from the new snapshot are left alone since snapshots are merged client-side.
+    """
+    ops = []
+    for key, value in current.items():
+        if key not in previous:
+            ops.append({"op": "add", "path": f"/{key}", "value": value})
+            continue
+        old = previous[key]
+        if old == value:
+            continue
+        if isinstance(old, dict) and isinstance(value, dict):
+            for field, field_value in value.items():
+                if field not in old:
+                    ops.append({"op": "add", "path": f"/{key}/{field}", "value": field_value})
+                elif old[field] != field_value:
+                    ops.append({"op": "replace", "path": f"/{key}/{field}", "value": field_value})
+            for field in old.keys() - value.keys():
+                ops.append({"op": "remove", "path": f"/{key}/{field}"})
+        else:
+            ops.append({"op": "replace", "path": f"/{key}", "value": value})
+    return ops
+
+
+def _drain_batch(first: bytes, queue: asyncio.Queue) -> bytes:
+    """Join the first message with whatever else is already queued, up to BATCH_MAX_BYTES, as one frame.
+
+    Each message is prefixed with its 4-byte big-endian length so the client can split the frame.
+    """
+    frames = [len(first).to_bytes(4, "big"), first]
+    size = len(first)
+    while size < BATCH_MAX_BYTES and not queue.empty():
+        payload = queue.get_nowait()
+        if not isinstance(payload, bytes):
+            payload = payload.encode()
+        frames.append(len(payload).to_bytes(4, "big"))
+        frames.append(payload)
+        size += len(payload)
+    return b"".join(frames)
+
+
+async def _close_quietly(ws: WebSocket):
+    try:
+        await ws.close()
+    except Exception:
+        pass
 
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[int, Set[WebSocket]] = {}
+        # Immutable views of active_connections rebuilt on register/unregister, so send paths iterate
+        # them without copying and a socket dropped mid-fan-out cannot disturb the iteration
+        self._account_sockets: Dict[int, Tuple[WebSocket, ...]] = {}
+        self._all_sockets: Tuple[WebSocket, ...] = ()
+        # Each socket gets a bounded outbound queue drained by its own writer task, so producers
+        # only enqueue and a slow client never stalls a snapshot or broadcast for everyone else
+        self._outboxes: Dict[WebSocket, Tuple[asyncio.Queue, asyncio.Task]] = {}
+        # Sockets whose client asked for binary frames (skips the str round-trip in the websocket stack)
+        self._binary_sockets: Set[WebSocket] = set()
+        # Binary sockets that take every frame as one or more 4-byte big-endian length-prefixed messages
+        self._batch_sockets: Set[WebSocket] = set()
+        # Sockets that accept snapshot_patch messages after their first full snapshot
+        self._patch_sockets: Set[WebSocket] = set()
+        # Last snapshot sent per account, the base patches are computed against
+        self._last_snapshot_dict: Dict[int, dict] = {}
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._snapshot_loop: Optional[asyncio.Task] = None
+        # Long-lived loop on a daemon thread for coroutines scheduled while no server loop is running
+        self._bg_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bg_loop_lock = threading.Lock()
+        # Per-account data version, bumped whenever a trade, position or decision update is pushed
+        self._dirty: Dict[int, int] = {}
+        # (account_id, snapshot kind) -> (data version, monotonic time built, snapshot, serialized snapshot)
+        self._last_payload: Dict[Tuple[int, str], Tuple[int, float, dict, bytes]] = {}
 
     async def connect(self, websocket: WebSocket):
         pass  # WebSocket is already accepted in the endpoint
 
+    def attach(self, websocket: WebSocket) -> Tuple[asyncio.Queue, asyncio.Task]:
+        """Create the outbound queue and writer task for a socket (must run on the event loop)."""
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=OUTBOX_MAX_MESSAGES)
+            outbox = (queue, asyncio.create_task(self._relay(websocket, queue)))
+            self._outboxes[websocket] = outbox
+        return outbox
+
+    def set_binary(self, websocket: WebSocket, enabled: bool):
+        """Opt a socket in or out of receiving JSON as binary (UTF-8) frames.
+
+        Server-only: the bundled frontend never sends ``binary`` and keeps reading text frames.
+        """
+        if enabled:
+            self._binary_sockets.add(websocket)
+        else:
+            self._binary_sockets.discard(websocket)
+
+    def set_batching(self, websocket: WebSocket, enabled: bool):
+        """Opt a binary socket in or out of receiving queued messages batched into one frame.
+
+        No bundled consumer splits these frames, so batching stays off unless an external client asks.
+        """
+        if enabled:
+            self._batch_sockets.add(websocket)
+        else:
+            self._batch_sockets.discard(websocket)
+
+    def set_patches(self, websocket: WebSocket, enabled: bool):
+        """Opt a socket in or out of receiving snapshot_patch diffs instead of repeated full snapshots.
+
+        Only for external clients that apply the ops; the bundled frontend does not ask for patches.
+        """
+        if enabled:
+            self._patch_sockets.add(websocket)
+        else:
+            self._patch_sockets.discard(websocket)
+
+    def detach(self, websocket: WebSocket):
+        """Stop the writer task for a socket that is going away."""
+        self._binary_sockets.discard(websocket)
+        self._batch_sockets.discard(websocket)
+        self._patch_sockets.discard(websocket)
+        outbox = self._outboxes.pop(websocket, None)
+        if outbox is not None and outbox[1] is not asyncio.current_task():
+            outbox[1].cancel()
+
+    async def _relay(self, websocket: WebSocket, queue: asyncio.Queue):
+        while True:
+            payload = await queue.get()
+            if isinstance(payload, bytes) and websocket in self._batch_sockets:
+                payload = _drain_batch(payload, queue)
+            if not await _safe_send(websocket, payload):
+                self._drop(websocket)
+                return
+
+    def _drop(self, websocket: WebSocket):
+        """Forget a closed or hopelessly slow socket everywhere and close it."""
+        for account_id in [aid for aid, sockets in self.active_connections.items() if websocket in sockets]:
+            self.unregister(account_id, websocket)
+        self.detach(websocket)
+        asyncio.ensure_future(_close_quietly(websocket))
+
+    def _fan_out(self, sockets: Iterable[WebSocket], payload: bytes):
+        """Queue one serialized message for several sockets; text clients share a single decode."""
+        text = None
+        for ws in sockets:
+            if ws in self._binary_sockets:
+                self._enqueue(ws, payload)
+            else:
+                if text is None:
+                    text = payload.decode()
+                self._enqueue(ws, text)
+
+    def _enqueue(self, websocket: WebSocket, payload: Union[str, bytes]):
+        # Only the endpoint attaches; a socket _drop() already detached must not get a new writer task
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return
+        queue, _ = outbox
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning(f"WebSocket outbox full ({OUTBOX_MAX_MESSAGES} messages), dropping slow client")
+            self._drop(websocket)
+
     def register(self, account_id: Optional[int], websocket: WebSocket):
         if account_id is not None:
             self.active_connections.setdefault(account_id, set()).add(websocket)
-            # Add scheduled snapshot task for new account (30 seconds to avoid Binance API rate limits)
-            add_account_snapshot_job(account_id, interval_seconds=30)
+            self._rebuild_views(account_id)
+            # A newly joined socket has no base to patch, so the next snapshot goes out in full
+            self._last_snapshot_dict.pop(account_id, None)
 
     def unregister(self, account_id: Optional[int], websocket: WebSocket):
         if account_id is not None and account_id in self.active_connections:
             self.active_connections[account_id].discard(websocket)
             if not self.active_connections[account_id]:
                 del self.active_connections[account_id]
-                # Remove the scheduled task for this account
-                remove_account_snapshot_job(account_id)
-
-    async def send_to_account(self, account_id: int, message: dict):
-        """Send message to all WebSocket connections for an account.
+                self._last_snapshot_dict.pop(account_id, None)
+                for key in [key for key in self._last_payload if key[0] == account_id]:
+                    del self._last_payload[key]
+            self._rebuild_views(account_id)
+
+    def _rebuild_views(self, account_id: int):
+        sockets = self.active_connections.get(account_id)
+        if sockets:
+            self._account_sockets[account_id] = tuple(sockets)
+        else:
+            self._account_sockets.pop(account_id, None)
+        # A socket registered under several ids still appears once
+        self._all_sockets = tuple({ws for views in self._account_sockets.values() for ws in views})
+
+    def mark_dirty(self, account_id: int):
+        """Invalidate cached snapshots for an account after its trading data changed."""
+        self._dirty[account_id] = self._dirty.get(account_id, 0) + 1
+
+    def data_version(self, account_id: int) -> int:
+        return self._dirty.get(account_id, 0)
+
+    def cached_snapshot(self, account_id: int, kind: str, version: int) -> Optional[Tuple[dict, bytes]]:
+        """Last snapshot (and its bytes) for an account if nothing changed and it is still fresh."""
+        cached = self._last_payload.get((account_id, kind))
+        if cached is None or cached[0] != version or time.monotonic() - cached[1] >= SNAPSHOT_REUSE_SECONDS:
+            return None
+        return cached[2], cached[3]
+
+    def remember_snapshot(self, account_id: int, kind: str, version: int, snapshot: dict, payload: bytes):
+        if account_id in self.active_connections:
+            self._last_payload[(account_id, kind)] = (version, time.monotonic(), snapshot, payload)
+
+    def send_snapshot(
+        self, account_id: int, snapshot: dict, payload: bytes, requester: Optional[WebSocket] = None
+    ):
+        """Queue a snapshot for an account: full for most sockets, a snapshot_patch for opted-in ones.
+
+        ``requester`` is a socket that explicitly asked for this snapshot (bootstrap, subscribe, switch_*,
+        get_snapshot); it always gets the full payload, even when nothing changed since the last send.
+        """
+        connections = self._account_sockets.get(account_id)
+        if not connections:
+            logger.debug(f"No active connections for account {account_id}")
+            return
 
-        Handles connection cleanup automatically when connections are closed.
+        previous = self._last_snapshot_dict.get(account_id)
+        self._last_snapshot_dict[account_id] = snapshot
+        patch_sockets = (
+            [ws for ws in connections if ws in self._patch_sockets and ws is not requester]
+            if previous is not None
+            else []
+        )
+        full_sockets = [
+            ws for ws in connections if ws not in self._patch_sockets or previous is None or ws is requester
+        ]
+        if full_sockets:
+            self._fan_out(full_sockets, payload)
+        if patch_sockets and previous is not snapshot:
+            ops = _diff_snapshot(previous, snapshot)
+            if ops:
+                patch = _serialize({"type": "snapshot_patch", "ops": ops})
+                if patch is not None:
+                    self._fan_out(patch_sockets, patch)
+
+    def send_payload_to_account(self, account_id: int, payload: bytes):
+        """Queue an already-serialized payload for all WebSocket connections of an account.
+
+        Closed or backed-up connections are dropped by their writer task.
         """
+        connections = self._account_sockets.get(account_id)
+        if not connections:
+            logger.debug(f"No active connections for account {account_id}")
+            return
+
+        self._fan_out(connections, payload)
+
+    async def send_to_account(self, account_id: int, message: dict):
+        """Send message to all WebSocket connections for an account."""
         if account_id not in self.active_connections:
             logger.debug(f"No active connections for account {account_id}")
             return
 
-        try:
-            payload = json.dumps(message, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"Failed to serialize message for account {account_id}: {e}")
+        payload = _serialize(message)
+        if payload is not None:
+            self.send_payload_to_account(account_id, payload)
+
+    async def send_to_accounts(self, account_ids, message: dict):
+        """Send the same message to several accounts, serializing it only once."""
+        targets = [account_id for account_id in account_ids if account_id in self.active_connections]
+        if not targets:
             return
 
-        # Make a copy of the list to avoid modification during iteration
-        connections_to_remove = []
-        for ws in list(self.active_connections[account_id]):
-            try:
-                # Send message - FastAPI WebSocket will raise exception if connection is closed
-                await ws.send_text(payload)
-            except (RuntimeError, ConnectionError, WebSocketDisconnect) as e:
-                # Connection is closed or error occurred - mark for removal
-                connections_to_remove.append(ws)
-            except Exception as e:
-                # Other unexpected errors
-                logger.warning(f"Unexpected error sending to WebSocket (account {account_id}): {type(e).__name__}: {e}")
-                connections_to_remove.append(ws)
-
-        # Remove closed connections
-        if connections_to_remove:
-            for ws in connections_to_remove:
-                self.active_connections[account_id].discard(ws)
-            # Clean up empty account entry
-            if not self.active_connections[account_id]:
-                del self.active_connections[account_id]
+        payload = _serialize(message)
+        if payload is None:
+            return
+        for account_id in targets:
+            self.send_payload_to_account(account_id, payload)
 
     async def broadcast_to_all(self, message: dict):
         """Broadcast message to all connected clients"""
-        try:
-            payload = json.dumps(message, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"Failed to serialize broadcast message: {e}")
+        payload = _serialize(message)
+        if payload is None:
             return
 
-        for account_id, websockets in list(self.active_connections.items()):
-            for ws in list(websockets):
-                try:
-                    # Check if WebSocket is still open before sending
-                    if ws.client_state.name != "CONNECTED":
-                        websockets.discard(ws)
-                        continue
-                    await ws.send_text(payload)
-                except Exception as e:
-                    # Log the error and remove broken connection
-                    logger.warning(
-                        f"Failed to broadcast message to WebSocket (account {account_id}): {type(e).__name__}: {e}",
-                        exc_info=True,
-                    )
-                    websockets.discard(ws)
+        self._fan_out(self._all_sockets, payload)
+
+    async def send_json(self, websocket: WebSocket, message: dict):
+        """Reply to a single socket through its outbox, so replies stay ordered with snapshots and broadcasts."""
+        payload = _serialize(message)
+        if payload is not None:
+            self._fan_out((websocket,), payload)
+
+    def send_reply(self, websocket: WebSocket, reply: Tuple[bytes, str]):
+        """Queue a pre-encoded constant reply (see ``_constant_reply``) for a single socket."""
+        payload, text = reply
+        self._enqueue(websocket, payload if websocket in self._binary_sockets else text)
 
     def has_connections(self) -> bool:
         return any(self.active_connections.values())
 
     def set_event_loop(self, loop: asyncio.AbstractEventLoop):
         if loop and loop.is_running():
+            if loop is not self._loop:
+                _log_event_loop_type(loop)
             self._loop = loop
+            if self._snapshot_loop is None or self._snapshot_loop.done():
+                self._snapshot_loop = loop.create_task(self._run_snapshots())
+
+    async def _run_snapshots(self):
+        """Refresh all connected accounts from one timer instead of one scheduler job per account."""
+        while True:
+            await asyncio.sleep(SNAPSHOT_INTERVAL_SECONDS)
+            account_ids = list(self.active_connections)
+            if not account_ids:
+                continue
+            semaphore = asyncio.Semaphore(SNAPSHOT_CONCURRENCY)
+            await asyncio.gather(*(self._snapshot_one(account_id, semaphore) for account_id in account_ids))
+
+    async def _snapshot_one(self, account_id: int, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            if account_id not in self.active_connections:
+                return
+            start_time = time.monotonic()
+            db: Session = SessionLocal()
+            try:
+                await _send_snapshot_optimized(db, account_id)
+            except Exception as e:
+                logger.error(f"Account {account_id} snapshot update failed: {e}")
+            finally:
+                db.close()
+            execution_time = time.monotonic() - start_time
+            if execution_time > 5:  # Log if execution takes longer than 5 seconds
+                logger.warning(f"Slow snapshot execution for account {account_id}: {execution_time:.2f}s")
 
     def schedule_task(self, coro):
         """Schedule an async coroutine to run in the event loop.
@@ -131,39 +470,43 @@ class ConnectionManager:
         else:
             try:
                 loop = asyncio.get_running_loop()
-                if loop.is_running() and not loop.is_closed():
+                if loop is self._bg_loop:
+                    pass  # Already on the fallback loop, don't mistake it for the server loop
+                elif loop.is_running() and not loop.is_closed():
                     self._loop = loop
                 else:
                     loop = None
             except RuntimeError:
                 loop = None
 
-        if loop and loop.is_running() and not loop.is_closed():
-            try:
-                future = asyncio.run_coroutine_threadsafe(coro, loop)
+        if not (loop and loop.is_running() and not loop.is_closed()):
+            # Fallback: hand the coroutine to the background loop so the caller is never blocked
+            loop = self._background_loop()
 
-                # Handle future exceptions - this is critical for error propagation
-                def _handle_future_exception(fut):
-                    try:
-                        fut.result()  # This will raise if the coro raised an exception
-                    except Exception as e:
-                        logger.error(f"Scheduled task failed: {type(e).__name__}: {e}", exc_info=True)
+        try:
+            future = asyncio.run_coroutine_threadsafe(coro, loop)
+        except Exception as e:
+            logger.error(f"Failed to schedule coroutine in event loop: {type(e).__name__}: {e}", exc_info=True)
+            coro.close()
+            return
 
-                future.add_done_callback(_handle_future_exception)
+        # Handle future exceptions - this is critical for error propagation
+        def _handle_future_exception(fut):
+            try:
+                fut.result()  # This will raise if the coro raised an exception
             except Exception as e:
-                logger.error(f"Failed to schedule coroutine in event loop: {type(e).__name__}: {e}", exc_info=True)
-                # Fall through to thread-based execution
-                loop = None
+                logger.error(f"Scheduled task failed: {type(e).__name__}: {e}", exc_info=True)
 
-        if not loop:
-            # Fallback: run in a dedicated daemon thread to avoid blocking the caller
-            def _run():
-                try:
-                    asyncio.run(coro)
-                except Exception as e:
-                    logger.error(f"Failed to run coroutine in thread: {type(e).__name__}: {e}", exc_info=True)
+        future.add_done_callback(_handle_future_exception)
 
-            threading.Thread(target=_run, daemon=True).start()
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        """Start (once) and return the event loop running forever on a daemon thread."""
+        with self._bg_loop_lock:
+            if self._bg_loop is None or self._bg_loop.is_closed():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="ws-background-loop", daemon=True).start()
+                self._bg_loop = loop
+            return self._bg_loop
 
 
 manager = ConnectionManager()
@@ -174,6 +517,7 @@ async def broadcast_asset_curve_update(timeframe: str = "1h"):
     db = SessionLocal()
     try:
         asset_curves = get_all_asset_curves_data(db, timeframe)
+        _store_asset_curves(timeframe, asset_curves)
         await manager.broadcast_to_all({"type": "asset_curve_update", "timeframe": timeframe, "data": asset_curves})
     except Exception as e:
         logging.error(f"Failed to broadcast asset curve update: {e}")
@@ -181,6 +525,13 @@ async def broadcast_asset_curve_update(timeframe: str = "1h"):
         db.close()
 
 
+async def broadcast_asset_curve_updates(curves_by_timeframe: Dict[str, list]):
+    """Broadcast precomputed asset curves for several timeframes to all connected clients"""
+    for timeframe, asset_curves in curves_by_timeframe.items():
+        _store_asset_curves(timeframe, asset_curves)
+        await manager.broadcast_to_all({"type": "asset_curve_update", "timeframe": timeframe, "data": asset_curves})
+
+
 async def broadcast_arena_asset_update(update_payload: dict):
     """Broadcast aggregated arena asset update to all connected clients"""
     message = {
@@ -190,6 +541,29 @@ async def broadcast_arena_asset_update(update_payload: dict):
     await manager.broadcast_to_all(message)
 
 
+def queue_arena_asset_update(update_payload: dict):
+    """Coalesce arena asset updates from price ticks into one broadcast per window.
+
+    Each update carries the full arena totals, so only the newest one in a window is sent.
+    Safe to call from the market data thread.
+    """
+    global _pending_arena_update
+    with _arena_update_lock:
+        flush_scheduled = _pending_arena_update is not None
+        _pending_arena_update = update_payload
+    if not flush_scheduled:
+        manager.schedule_task(_flush_arena_asset_update())
+
+
+async def _flush_arena_asset_update():
+    global _pending_arena_update
+    await asyncio.sleep(ARENA_UPDATE_COALESCE_SECONDS)
+    with _arena_update_lock:
+        update_payload, _pending_arena_update = _pending_arena_update, None
+    if update_payload is not None:
+        await broadcast_arena_asset_update(update_payload)
+
+
 async def broadcast_trade_update(trade_data: dict):
     """Broadcast trade update to specific account when trade is executed
 
@@ -201,6 +575,7 @@ async def broadcast_trade_update(trade_data: dict):
         logging.warning("broadcast_trade_update called without account_id")
         return
 
+    manager.mark_dirty(account_id)
     try:
         await manager.send_to_account(account_id, {"type": "trade_update", "trade": trade_data})
     except Exception as e:
@@ -214,6 +589,7 @@ async def broadcast_position_update(account_id: int, positions_data: list):
         account_id: Account ID to send update to
         positions_data: List of position dictionaries
     """
+    manager.mark_dirty(account_id)
     try:
         await manager.send_to_account(account_id, {"type": "position_update", "positions": positions_data})
     except Exception as e:
@@ -231,6 +607,7 @@ async def broadcast_model_chat_update(decision_data: dict):
         logger.warning("broadcast_model_chat_update called without account_id")
         return
 
+    manager.mark_dirty(account_id)
     try:
         await manager.send_to_account(account_id, {"type": "model_chat_update", "decision": decision_data})
     except Exception as e:
@@ -253,27 +630,144 @@ def get_all_asset_curves_data(db: Session, timeframe: str = "1h"):
     return get_all_asset_curves_data_new(db, timeframe)
 
 
-async def _send_snapshot_optimized(db: Session, account_id: int):
-    """Optimized version of snapshot that reduces expensive operations"""
-    # The db parameter should already be from the correct database (real or paper)
-    account = db.query(Account).filter(Account.id == account_id).first()
-    if not account:
-        logging.warning(f"[SNAPSHOT] Account {account_id} not found in database for snapshot")
-        return
+async def _fetch_broker_state(account: Account) -> Tuple[Optional[Decimal], list, list]:
+    """Balance, positions and open orders from Binance, fetched concurrently; empty when Binance fails."""
+    try:
+        (balance, positions_data), orders_data = await asyncio.gather(
+            get_balance_and_positions_async(account),
+            get_open_orders_async(account),
+        )
+        return balance, positions_data, orders_data
+    except Exception as e:
+        logger.warning(f"Failed to fetch Binance data for account {account.id}: {e}")
+        return None, [], []
+
+
+# Only the columns the snapshot serializes (skips the large AI prompt/reasoning snapshots), labelled
+# with their payload keys so rows can be spread straight into the message; the serializer turns
+# Decimal into float
+_SNAPSHOT_TRADE_COLUMNS = (
+    Trade.id,
+    Trade.order_id,
+    Trade.account_id.label("user_id"),
+    Trade.symbol,
+    Trade.name,
+    Trade.market,
+    Trade.side,
+    Trade.price,
+    Trade.quantity,
+    Trade.commission,
+    Trade.trade_time,
+)
+_SNAPSHOT_DECISION_COLUMNS = (
+    AIDecisionLog.id,
+    AIDecisionLog.decision_time,
+    AIDecisionLog.reason,
+    AIDecisionLog.operation,
+    AIDecisionLog.symbol,
+    AIDecisionLog.prev_portion,
+    AIDecisionLog.target_portion,
+    AIDecisionLog.total_balance,
+    AIDecisionLog.executed,
+    AIDecisionLog.order_id,
+)
+
+
+def load_snapshot_bundle(account_id: int, limit: int) -> Tuple[list, list]:
+    """Most recent trades and AI decisions for an account as row mappings keyed by payload field.
+
+    Both queries run back-to-back in one transaction on a single connection; intended to
+    run on a worker thread, so it opens its own session.
+    """
+    db = ReadSessionLocal()
+    try:
+        with db.begin():
+            trades = db.execute(
+                select(*_SNAPSHOT_TRADE_COLUMNS)
+                .where(Trade.account_id == account_id)
+                .order_by(Trade.trade_time.desc())
+                .limit(limit)
+            ).mappings().all()
+            ai_decisions = db.execute(
+                select(*_SNAPSHOT_DECISION_COLUMNS)
+                .where(AIDecisionLog.account_id == account_id)
+                .order_by(AIDecisionLog.decision_time.desc())
+                .limit(limit)
+            ).mappings().all()
+        return trades, ai_decisions
+    finally:
+        db.close()
+
 
-    # Get balance and positions from Binance in real-time (single API call)
+def _load_asset_curves(timeframe: str) -> list:
+    """Asset curves for all accounts; runs on a worker thread with its own session."""
+    db = ReadSessionLocal()
     try:
-        balance, positions_data = get_balance_and_positions(account)
-        current_cash = float(balance) if balance is not None else 0.0
-        orders_data = get_open_orders(account)
+        return get_all_asset_curves_data(db, timeframe)
+    finally:
+        db.close()
+
+
+def _store_asset_curves(timeframe: str, asset_curves: list):
+    """Record freshly computed curves so snapshots in the next TTL window reuse them."""
+    _asset_curve_cache[timeframe] = (time.monotonic(), asset_curves)
+
+
+async def get_cached_asset_curves(timeframe: str) -> list:
+    """Asset curves for all accounts, shared across every connected account for a short TTL.
+
+    The curves are identical for every snapshot, so concurrent misses wait on one computation.
+    """
+    entry = _asset_curve_cache.get(timeframe)
+    if entry and time.monotonic() - entry[0] < ASSET_CURVE_CACHE_TTL_SECONDS:
+        return entry[1]
+
+    lock = _asset_curve_locks.setdefault(timeframe, asyncio.Lock())
+    async with lock:
+        # Another waiter may have refreshed the entry while we were queued
+        entry = _asset_curve_cache.get(timeframe)
+        if entry and time.monotonic() - entry[0] < ASSET_CURVE_CACHE_TTL_SECONDS:
+            return entry[1]
+        asset_curves = await asyncio.to_thread(_load_asset_curves, timeframe)
+        _store_asset_curves(timeframe, asset_curves)
+        return asset_curves
+
+
+async def _fetch_prices(unique_symbols) -> Tuple[Dict[Tuple[str, str], Optional[float]], Optional[str]]:
+    """Batched latest prices for (symbol, market) pairs plus an error message for the client, if any."""
+    if not unique_symbols:
+        return {}, None
+    try:
+        return await asyncio.to_thread(get_last_prices_bulk, unique_symbols), None
     except Exception as e:
-        logger.debug(f"_send_snapshot_optimized: Failed to get balance/positions from Binance: {e}")
-        current_cash = 0.0
-        positions_data = []
-        orders_data = []
+        logger.warning(f"Failed to fetch prices for snapshot: {e}")
+        return {}, str(e)
 
-    logger.debug(f"_send_snapshot_optimized: account_id={account_id}, cash=${current_cash:.2f}")
-    logging.info(f"[SNAPSHOT] Sending snapshot for account {account_id}, cash=${current_cash:.2f}")
+
+def _account_overview_fields(account: Account) -> dict:
+    """Plain copy of the account columns a snapshot shows, safe to hand to a builder thread."""
+    return {
+        "id": account.id,
+        "user_id": account.user_id,
+        "name": account.name,
+        "account_type": account.account_type,
+    }
+
+
+def _build_fast_snapshot(
+    account_fields: dict,
+    balance: Optional[Decimal],
+    positions_data: list,
+    orders_data: list,
+    trades: list,
+    ai_decisions: list,
+    price_cache: Dict[Tuple[str, str], Optional[float]],
+    asset_curves: Optional[list],
+    price_error_message: Optional[str],
+) -> Tuple[dict, Optional[bytes]]:
+    """Assemble and serialize the optimized snapshot; runs on the snapshot build pool."""
+    account_id = account_fields["id"]
+    current_cash = float(balance) if balance is not None else 0.0
 
     # Convert Binance positions to format expected by frontend
     positions = [
@@ -309,32 +803,16 @@ async def _send_snapshot_optimized(db: Session, account_id: int):
         for i, order in enumerate(orders_data)
     ]
 
-    # Get trades from metadata DB (completed trades are stored)
-    trades = db.query(Trade).filter(Trade.account_id == account_id).order_by(Trade.trade_time.desc()).limit(10).all()
-    ai_decisions = (
-        db.query(AIDecisionLog)
-        .filter(AIDecisionLog.account_id == account_id)
-        .order_by(AIDecisionLog.decision_time.desc())
-        .limit(10)
-        .all()
-    )
-
     # Calculate positions value from real-time data
     positions_value = 0.0
-    for pos in positions_data:
-        try:
-            price = get_last_price(pos["symbol"], "CRYPTO")
-            if price:
-                positions_value += float(price) * float(pos["quantity"])
-        except Exception:
-            pass
+    for p in positions:
+        price = price_cache.get((p["symbol"], p["market"]))
+        if price:
+            positions_value += float(price) * p["quantity"]
 
     overview = {
         "account": {
-            "id": account.id,
-            "user_id": account.user_id,
-            "name": account.name,
-            "account_type": account.account_type,
+            **account_fields,
             "initial_capital": current_cash,  # Use current balance as baseline for return calculation
             "current_cash": current_cash,
             "frozen_cash": 0.0,  # Not tracked - all data from Binance
@@ -345,22 +823,6 @@ async def _send_snapshot_optimized(db: Session, account_id: int):
 
     # Enrich positions with latest price and market value
     enriched_positions = []
-    price_error_message = None
-
-    # Group positions by symbol to reduce API calls
-    unique_symbols = set((p["symbol"], p["market"]) for p in positions)
-    price_cache = {}
-
-    # Fetch all unique prices in one go
-    for symbol, market in unique_symbols:
-        try:
-            price = get_last_price(symbol, market)
-            price_cache[(symbol, market)] = price
-        except Exception as e:
-            price_cache[(symbol, market)] = None
-            error_msg = str(e)
-            if "cookie" in error_msg.lower() and price_error_message is None:
-                price_error_message = error_msg
 
     for p in positions:
         price = price_cache.get((p["symbol"], p["market"]))
@@ -386,87 +848,57 @@ async def _send_snapshot_optimized(db: Session, account_id: int):
         "positions": enriched_positions,
         "orders": [
             {
-                "id": o.id,
-                "order_no": o.order_no,
-                "user_id": o.account_id,
-                "symbol": o.symbol,
-                "name": o.name,
-                "market": o.market,
-                "side": o.side,
-                "order_type": o.order_type,
-                "price": float(o.price) if o.price is not None else None,
-                "quantity": float(o.quantity),
-                "filled_quantity": float(o.filled_quantity),
-                "status": o.status,
+                "id": o["id"],
+                "order_no": o["order_no"],
+                "user_id": o["account_id"],
+                "symbol": o["symbol"],
+                "name": o["name"],
+                "market": o["market"],
+                "side": o["side"],
+                "order_type": o["order_type"],
+                "price": o["price"],
+                "quantity": o["quantity"],
+                "filled_quantity": o["filled_quantity"],
+                "status": o["status"],
             }
             for o in orders[:10]  # Reduced from 20 to 10
         ],
-        "trades": [
-            {
-                "id": t.id,
-                "order_id": t.order_id,
-                "user_id": t.account_id,
-                "symbol": t.symbol,
-                "name": t.name,
-                "market": t.market,
-                "side": t.side,
-                "price": float(t.price),
-                "quantity": float(t.quantity),
-                "commission": float(t.commission),
-                "trade_time": str(t.trade_time),
-            }
-            for t in trades
-        ],
+        "trades": [{**t, "trade_time": str(t["trade_time"])} for t in trades],
         "ai_decisions": [
             {
-                "id": d.id,
-                "decision_time": str(d.decision_time),
-                "reason": d.reason,
-                "operation": d.operation,
-                "symbol": d.symbol,
-                "prev_portion": float(d.prev_portion),
-                "target_portion": float(d.target_portion),
-                "total_balance": float(d.total_balance),
-                "executed": str(d.executed).lower() if d.executed else "false",
-                "order_id": d.order_id,
+                **d,
+                "decision_time": str(d["decision_time"]),
+                "executed": str(d["executed"]).lower() if d["executed"] else "false",
             }
             for d in ai_decisions
         ],
         # Asset curves only included occasionally (every minute)
-        "timestamp": datetime.now().timestamp(),
+        "timestamp": time.time(),
     }
 
-    # Only include expensive asset curve data every 60 seconds
-    current_second = int(datetime.now().timestamp()) % 60
-    if current_second < 10:  # First 10 seconds of each minute
-        try:
-            response_data["all_asset_curves"] = get_all_asset_curves_data(db, "1h")
-            response_data["type"] = "snapshot_full"  # Indicate this includes full data
-        except Exception as e:
-            logging.error(f"Failed to get asset curves: {e}")
+    if asset_curves is not None:
+        response_data["all_asset_curves"] = asset_curves
+        response_data["type"] = "snapshot_full"  # Indicate this includes full data
 
     if price_error_message:
         response_data["warning"] = {"type": "market_data_error", "message": price_error_message}
 
-    await manager.send_to_account(account_id, response_data)
-
+    return response_data, _serialize(response_data)
 
-async def _send_snapshot(db: Session, account_id: int):
-    """Send snapshot - trading data fetched from Binance in real-time"""
-    # Get account metadata from metadata database
-    account = db.query(Account).filter(Account.id == account_id).first()
-    if not account:
-        return
 
-    # Get trading data from Binance in real-time (single API call for balance and positions)
-    try:
-        balance, positions_data = get_balance_and_positions(account)
-        orders_data = get_open_orders(account)
-    except Exception as e:
-        logging.error(f"Failed to fetch Binance data for account {account_id}: {e}")
-        balance = None
-        positions_data = []
-        orders_data = []
+def _build_full_snapshot(
+    account_fields: dict,
+    balance: Optional[Decimal],
+    positions_data: list,
+    orders_data: list,
+    trades: list,
+    ai_decisions: list,
+    price_cache: Dict[Tuple[str, str], Optional[float]],
+    all_asset_curves: list,
+    price_error_message: Optional[str],
+) -> Tuple[dict, Optional[bytes]]:
+    """Assemble and serialize the full snapshot; runs on the snapshot build pool."""
+    account_id = account_fields["id"]
 
     # Convert Binance positions to format expected by frontend
     positions = [
@@ -499,33 +931,18 @@ async def _send_snapshot(db: Session, account_id: int):
         for i, order in enumerate(orders_data)
     ]
 
-    # Get trades and AI decisions from metadata database
-    trades = db.query(Trade).filter(Trade.account_id == account_id).order_by(Trade.trade_time.desc()).limit(20).all()
-    ai_decisions = (
-        db.query(AIDecisionLog)
-        .filter(AIDecisionLog.account_id == account_id)
-        .order_by(AIDecisionLog.decision_time.desc())
-        .limit(20)
-        .all()
-    )
     # Calculate positions value
     positions_value = 0.0
-    for pos in positions_data:
-        try:
-            price = get_last_price(pos["symbol"], "CRYPTO")
-            if price:
-                positions_value += float(price) * float(pos["quantity"])
-        except Exception:
-            pass
+    for p in positions:
+        price = price_cache.get((p["symbol"], p["market"]))
+        if price:
+            positions_value += float(price) * p["quantity"]
 
     current_cash = float(balance) if balance is not None else 0.0
 
     overview = {
         "account": {
-            "id": account.id,
-            "user_id": account.user_id,
-            "name": account.name,
-            "account_type": account.account_type,
+            **account_fields,
             "current_cash": current_cash,
             "frozen_cash": 0.0,  # Not tracked - all data from Binance
         },
@@ -534,19 +951,10 @@ async def _send_snapshot(db: Session, account_id: int):
     }
     # enrich positions with latest price and market value
     enriched_positions = []
-    price_error_message = None
 
     for p in positions:
         # p is a dict, not an object (from Binance API data)
-        try:
-            price = get_last_price(p["symbol"], p.get("market", "CRYPTO"))
-        except Exception as e:
-            price = None
-            # Collect price retrieval error messages, especially cookie-related errors
-            error_msg = str(e)
-            if "cookie" in error_msg.lower() and price_error_message is None:
-                price_error_message = error_msg
-
+        price = price_cache.get((p["symbol"], p["market"]))
         enriched_positions.append(
             {
                 "id": p["id"],
@@ -584,44 +992,127 @@ async def _send_snapshot(db: Session, account_id: int):
             }
             for o in orders[:20]
         ],
-        "trades": [
-            {
-                "id": t.id,
-                "order_id": t.order_id,
-                "user_id": t.account_id,
-                "symbol": t.symbol,
-                "name": t.name,
-                "market": t.market,
-                "side": t.side,
-                "price": float(t.price),
-                "quantity": float(t.quantity),
-                "commission": float(t.commission),
-                "trade_time": str(t.trade_time),
-            }
-            for t in trades
-        ],
+        "trades": [{**t, "trade_time": str(t["trade_time"])} for t in trades],
         "ai_decisions": [
             {
-                "id": d.id,
-                "decision_time": str(d.decision_time),
-                "reason": d.reason,
-                "operation": d.operation,
-                "symbol": d.symbol,
-                "prev_portion": float(d.prev_portion),
-                "target_portion": float(d.target_portion),
-                "total_balance": float(d.total_balance),
-                "executed": str(d.executed).lower() if d.executed else "false",
-                "order_id": d.order_id,
+                **d,
+                "decision_time": str(d["decision_time"]),
+                "executed": str(d["executed"]).lower() if d["executed"] else "false",
             }
             for d in ai_decisions
         ],
-        "all_asset_curves": get_all_asset_curves_data(db, "1h"),
+        "all_asset_curves": all_asset_curves,
     }
 
     if price_error_message:
         response_data["warning"] = {"type": "market_data_error", "message": price_error_message}
 
-    await manager.send_to_account(account_id, response_data)
+    return response_data, _serialize(response_data)
+
+
+def _position_symbols(positions_data: list) -> Set[Tuple[str, str]]:
+    # Binance positions are all crypto
+    return {(pos["symbol"], "CRYPTO") for pos in positions_data}
+
+
+async def _send_snapshot_optimized(db: Session, account_id: int):
+    """Optimized version of snapshot that reduces expensive operations"""
+    # Only include expensive asset curve data every 60 seconds (first 10 seconds of each minute)
+    include_curves = int(time.time()) % 60 < 10
+    kind = "optimized_full" if include_curves else "optimized"
+    version = manager.data_version(account_id)
+    cached = manager.cached_snapshot(account_id, kind, version)
+    if cached is not None:
+        manager.send_snapshot(account_id, *cached)
+        return
+
+    # The db parameter should already be from the correct database (real or paper)
+    account = db.query(Account).filter(Account.id == account_id).first()
+    if not account:
+        logging.warning(f"[SNAPSHOT] Account {account_id} not found in database for snapshot")
+        return
+
+    # Binance state and metadata DB rows are fetched concurrently, none of it on the event loop
+    (balance, positions_data, orders_data), (trades, ai_decisions) = await asyncio.gather(
+        _fetch_broker_state(account),
+        asyncio.to_thread(load_snapshot_bundle, account_id, 10),
+    )
+    current_cash = float(balance) if balance is not None else 0.0
+
+    logger.debug(f"_send_snapshot_optimized: account_id={account_id}, cash=${current_cash:.2f}")
+    logging.info(f"[SNAPSHOT] Sending snapshot for account {account_id}, cash=${current_cash:.2f}")
+
+    # Price every distinct symbol once, in one batched lookup off the event loop
+    price_cache, price_error_message = await _fetch_prices(_position_symbols(positions_data))
+
+    asset_curves = None
+    if include_curves:
+        try:
+            asset_curves = await get_cached_asset_curves("1h")
+        except Exception as e:
+            logging.error(f"Failed to get asset curves: {e}")
+
+    response_data, payload = await asyncio.get_running_loop().run_in_executor(
+        _snapshot_executor,
+        _build_fast_snapshot,
+        _account_overview_fields(account),
+        balance,
+        positions_data,
+        orders_data,
+        trades,
+        ai_decisions,
+        price_cache,
+        asset_curves,
+        price_error_message,
+    )
+    if payload is not None:
+        manager.remember_snapshot(account_id, kind, version, response_data, payload)
+        manager.send_snapshot(account_id, response_data, payload)
+
+
+async def _send_snapshot(db: Session, account_id: int, requester: Optional[WebSocket] = None):
+    """Send snapshot - trading data fetched from Binance in real-time
+
+    ``requester`` is the socket that asked for it; it gets the full snapshot even if nothing changed.
+    """
+    version = manager.data_version(account_id)
+    cached = manager.cached_snapshot(account_id, "full", version)
+    if cached is not None:
+        manager.send_snapshot(account_id, *cached, requester=requester)
+        return
+
+    # Get account metadata from metadata database
+    account = db.query(Account).filter(Account.id == account_id).first()
+    if not account:
+        return
+
+    # Trading data from Binance in real-time plus trades, AI decisions and asset curves from the
+    # metadata database, all fetched concurrently off the event loop
+    (balance, positions_data, orders_data), (trades, ai_decisions), all_asset_curves = await asyncio.gather(
+        _fetch_broker_state(account),
+        asyncio.to_thread(load_snapshot_bundle, account_id, 20),
+        get_cached_asset_curves("1h"),
+    )
+
+    # Price every distinct symbol once, in one batched lookup off the event loop
+    price_cache, price_error_message = await _fetch_prices(_position_symbols(positions_data))
+
+    response_data, payload = await asyncio.get_running_loop().run_in_executor(
+        _snapshot_executor,
+        _build_full_snapshot,
+        _account_overview_fields(account),
+        balance,
+        positions_data,
+        orders_data,
+        trades,
+        ai_decisions,
+        price_cache,
+        all_asset_curves,
+        price_error_message,
+    )
+    if payload is not None:
+        manager.remember_snapshot(account_id, "full", version, response_data, payload)
+        manager.send_snapshot(account_id, response_data, payload, requester=requester)
 
 
 async def websocket_endpoint(websocket: WebSocket):
@@ -630,13 +1121,17 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.set_event_loop(asyncio.get_running_loop())
     except RuntimeError:
         pass
+    manager.attach(websocket)
     account_id: int | None = None
     user_id: int | None = None  # Initialize user_id to avoid UnboundLocalError
+    # One session for the whole connection; each message ends its transaction so the pooled connection
+    # is only held while a message is being handled
+    db: Session = SessionLocal()  # Paper DB for account metadata
 
     try:
         while True:
             # Check if WebSocket is still connected before trying to receive
-            if websocket.client_state.name != "CONNECTED":
+            if websocket.client_state is not _CONNECTED:
                 break
 
             try:
@@ -650,16 +1145,24 @@ async def websocket_endpoint(websocket: WebSocket):
                 break
 
             try:
-                msg = json.loads(data)
+                msg = json_loads(data)
             except json.JSONDecodeError as e:
                 logging.error(f"Invalid JSON received: {e}")
                 try:
-                    await websocket.send_text(json.dumps({"type": "error", "message": "Invalid JSON format"}))
+                    manager.send_reply(websocket, INVALID_JSON_REPLY)
                 except Exception:
                     break
                 continue
             kind = msg.get("type")
-            db: Session = SessionLocal()  # Paper DB for account metadata
+            if kind in ("bootstrap", "subscribe") and "binary" in msg:
+                # Clients that decode ArrayBuffer frames can opt in to binary JSON frames
+                manager.set_binary(websocket, bool(msg.get("binary")))
+            if kind in ("bootstrap", "subscribe") and "batch" in msg:
+                # Binary clients that split length-prefixed frames can take queued messages in one write
+                manager.set_batching(websocket, bool(msg.get("batch")))
+            if kind in ("bootstrap", "subscribe") and "patches" in msg:
+                # Clients that apply snapshot_patch ops get diffs after their first full snapshot
+                manager.set_patches(websocket, bool(msg.get("patches")))
             try:
                 if kind == "bootstrap":
                     #  mode: Create or get default default user
@@ -694,17 +1197,16 @@ async def websocket_endpoint(websocket: WebSocket):
                                     "account": {"id": account.id, "name": account.name, "user_id": account.user_id},
                                 },
                             )
-                            await _send_snapshot(db, account_id)
+                            await _send_snapshot(db, account_id, websocket)
                         else:
                             # Send bootstrap with no account info
-                            await websocket.send_text(
-                                json.dumps(
-                                    {
-                                        "type": "bootstrap_ok",
-                                        "user": {"id": user.id, "username": user.username},
-                                        "account": None,
-                                    }
-                                )
+                            await manager.send_json(
+                                websocket,
+                                {
+                                    "type": "bootstrap_ok",
+                                    "user": {"id": user.id, "username": user.username},
+                                    "account": None,
+                                },
                             )
                     except Exception as e:
                         logging.error(f"Failed to send bootstrap response: {e}", exc_info=True)
@@ -715,14 +1217,14 @@ async def websocket_endpoint(websocket: WebSocket):
                     u = get_user(db, uid)
                     if not u:
                         try:
-                            await websocket.send_text(json.dumps({"type": "error", "message": "user not found"}))
+                            manager.send_reply(websocket, USER_NOT_FOUND_REPLY)
                         except Exception:
                             break
                         continue
                     user_id = uid
                     manager.register(user_id, websocket)
                     try:
-                        await _send_snapshot(db, user_id)
+                        await _send_snapshot(db, user_id, websocket)
                     except Exception as e:
                         logging.error(f"Failed to send snapshot: {e}")
                         break
@@ -730,7 +1232,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     # Switch to different user account
                     target_username = msg.get("username")
                     if not target_username:
-                        await websocket.send_text(json.dumps({"type": "error", "message": "username required"}))
+                        await manager.send_json(websocket, {"type": "error", "message": "username required"})
                         continue
 
                     # Unregister from current user if any
@@ -749,12 +1251,12 @@ async def websocket_endpoint(websocket: WebSocket):
                         user_id,
                         {"type": "user_switched", "user": {"id": target_user.id, "username": target_user.username}},
                     )
-                    await _send_snapshot(db, user_id)
+                    await _send_snapshot(db, user_id, websocket)
                 elif kind == "switch_account":
                     # Switch to different account by ID
                     target_account_id = msg.get("account_id")
                     if not target_account_id:
-                        await websocket.send_text(json.dumps({"type": "error", "message": "account_id required"}))
+                        await manager.send_json(websocket, {"type": "error", "message": "account_id required"})
                         continue
 
                     # Unregister from current account if any
@@ -764,7 +1266,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     # Get target account from paper DB (metadata)
                     target_account = get_account(db, target_account_id)
                     if not target_account:
-                        await websocket.send_text(json.dumps({"type": "error", "message": "account not found"}))
+                        manager.send_reply(websocket, ACCOUNT_NOT_FOUND_REPLY)
                         continue
 
                     account_id = target_account.id
@@ -784,46 +1286,46 @@ async def websocket_endpoint(websocket: WebSocket):
                             },
                         },
                     )
-                    await _send_snapshot(db, account_id)
+                    await _send_snapshot(db, account_id, websocket)
                 elif kind == "get_snapshot":
                     if account_id is not None:
                         account = get_account(db, account_id)
                         if account:
-                            await _send_snapshot(db, account_id)
+                            await _send_snapshot(db, account_id, websocket)
                 elif kind == "get_asset_curve":
                     # Get asset curve data with specific timeframe
                     timeframe = msg.get("timeframe", "1h")
                     if timeframe not in ["5m", "1h", "1d"]:
-                        await websocket.send_text(
-                            json.dumps({"type": "error", "message": "Invalid timeframe. Must be 5m, 1h, or 1d"})
+                        await manager.send_json(
+                            websocket, {"type": "error", "message": "Invalid timeframe. Must be 5m, 1h, or 1d"}
                         )
                         continue
 
-                    asset_curves = get_all_asset_curves_data(db, timeframe)
-                    await websocket.send_text(
-                        json.dumps({"type": "asset_curve_data", "timeframe": timeframe, "data": asset_curves})
+                    asset_curves = await get_cached_asset_curves(timeframe)
+                    await manager.send_json(
+                        websocket, {"type": "asset_curve_data", "timeframe": timeframe, "data": asset_curves}
                     )
                 elif kind == "place_order":
                     if account_id is None:
-                        await websocket.send_text(json.dumps({"type": "error", "message": "not authenticated"}))
+                        manager.send_reply(websocket, NOT_AUTHENTICATED_REPLY)
                         continue
 
                     try:
                         # Get account metadata from paper DB
                         account_meta = get_account(db, account_id)
                         if not account_meta:
-                            await websocket.send_text(json.dumps({"type": "error", "message": "account not found"}))
+                            manager.send_reply(websocket, ACCOUNT_NOT_FOUND_REPLY)
                             continue
 
                         user = get_user(db, account_meta.user_id)
                         if not user:
-                            await websocket.send_text(json.dumps({"type": "error", "message": "user not found"}))
+                            manager.send_reply(websocket, USER_NOT_FOUND_REPLY)
                             continue
 
                         # Get account metadata from metadata database
                         account = get_account(db, account_id)
                         if not account:
-                            await websocket.send_text(json.dumps({"type": "error", "message": "account not found"}))
+                            manager.send_reply(websocket, ACCOUNT_NOT_FOUND_REPLY)
                             continue
 
                         # Extract order parameters
@@ -837,8 +1339,8 @@ async def websocket_endpoint(websocket: WebSocket):
 
                         # Validate required parameters
                         if not all([symbol, side, order_type, quantity]):
-                            await websocket.send_text(
-                                json.dumps({"type": "error", "message": "missing required parameters"})
+                            await manager.send_json(
+                                websocket, {"type": "error", "message": "missing required parameters"}
                             )
                             continue
 
@@ -846,50 +1348,55 @@ async def websocket_endpoint(websocket: WebSocket):
                         try:
                             quantity = float(quantity)
                         except (ValueError, TypeError):
-                            await websocket.send_text(json.dumps({"type": "error", "message": "invalid quantity"}))
+                            manager.send_reply(websocket, INVALID_QUANTITY_REPLY)
                             continue
 
                         # Orders are placed directly on Binance (via trading_commands.py)
                         # This endpoint is deprecated for real trading - orders should go through Binance API
-                        await websocket.send_text(
-                            json.dumps(
-                                {
-                                    "type": "error",
-                                    "message": "Orders are placed directly on Binance. Use the trading API instead.",
-                                }
-                            )
+                        await manager.send_json(
+                            websocket,
+                            {
+                                "type": "error",
+                                "message": "Orders are placed directly on Binance. Use the trading API instead.",
+                            },
                         )
 
                         # Send updated snapshot
-                        await _send_snapshot(db, account_id)
+                        await _send_snapshot(db, account_id, websocket)
 
                     except ValueError as e:
                         # Business logic errors (insufficient funds, etc.)
                         try:
-                            await websocket.send_text(json.dumps({"type": "error", "message": str(e)}))
+                            await manager.send_json(websocket, {"type": "error", "message": str(e)})
                         except Exception:
                             break
                     except Exception as e:
                         # Unexpected errors
                         logger.error(f"Order placement error: {e}", exc_info=True)
                         try:
-                            await websocket.send_text(
-                                json.dumps({"type": "error", "message": f"order placement failed: {str(e)}"})
+                            await manager.send_json(
+                                websocket, {"type": "error", "message": f"order placement failed: {str(e)}"}
                             )
                         except Exception:
                             break
                 elif kind == "ping":
                     try:
-                        await websocket.send_text(json.dumps({"type": "pong"}))
+                        manager.send_reply(websocket, PONG_REPLY)
                     except Exception:
                         break
                 else:
                     try:
-                        await websocket.send_text(json.dumps({"type": "error", "message": "unknown message"}))
+                        manager.send_reply(websocket, UNKNOWN_MESSAGE_REPLY)
                     except Exception:
                         break
+            except BaseException:
+                db.rollback()
+                raise
             finally:
-                db.close()
+                # Repositories commit their own writes; this just ends a read transaction left open. A failed
+                # message was rolled back above, leaving none (finally, not else: handlers exit via continue)
+                if db.in_transaction():
+                    db.commit()
     except WebSocketDisconnect:
         if account_id is not None:
             manager.unregister(account_id, websocket)
@@ -902,3 +1409,5 @@ async def websocket_endpoint(websocket: WebSocket):
             manager.unregister(account_id, websocket)
         if user_id is not None:
             manager.unregister(user_id, websocket)
+        manager.detach(websocket)
+        db.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 # Single database: stores account metadata (LLM config) and AI decision logs
@@ -6,10 +6,53 @@ from sqlalchemy.orm import declarative_base, sessionmaker
 DATABASE_URL = "sqlite:///./metadata.db"
 
 # Create engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# The default pool (5 + 10 overflow) serializes concurrent snapshot, analytics and WebSocket sessions
+# behind connection checkout; SQLite connections are cheap, so allow enough for those bursts
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=32,
+    max_overflow=64,
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection: WAL lets readers run alongside the single writer."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL; fsync only at checkpoints
+        cursor.execute("PRAGMA busy_timeout=5000")  # Wait for a lock instead of failing with "database is locked"
+        cursor.execute("PRAGMA cache_size=-16000")  # 16 MB page cache per connection (the pool holds many)
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+# Separate pool for read-only work (snapshot reads, active-account lookups) so readers never queue
+# behind writer sessions; with WAL these connections read concurrently with the single writer
+read_engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=16,
+    max_overflow=32,
+)
+event.listen(read_engine, "connect", _set_sqlite_pragmas)
+
+
+@event.listens_for(read_engine, "connect")
+def _set_query_only(dbapi_connection, connection_record):
+    """Reject writes on the read pool (mode=ro URIs break when the WAL index files are missing)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
 
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
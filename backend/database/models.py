@@ -8,10 +8,12 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -49,6 +51,10 @@ class Account(Base):
     """
 
     __tablename__ = "accounts"
+    __table_args__ = (
+        # Partial index backing the "active accounts" filter used by nearly every account query
+        Index("ix_accounts_active_type", "account_type", sqlite_where=text("is_active = 'true'")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -153,6 +159,11 @@ class Trade(Base):
 
     order = relationship("Order", back_populates="trades")
 
+    __table_args__ = (
+        # Backs the newest-first trade feeds (ORDER BY trade_time DESC with an optional cursor)
+        Index("ix_trades_account_time", "account_id", "trade_time"),
+    )
+
 
 class TradingConfig(Base):
     __tablename__ = "trading_configs"
@@ -37,10 +37,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from services.asset_curve_calculator import invalidate_asset_curve_cache
-from sqlalchemy import text
+from services.json_utils import DefaultJSONResponse
+from sqlalchemy import delete, select, text
 from sqlalchemy.orm import Session
 
-app = FastAPI(title="Crypto Paper Trading API")
+app = FastAPI(title="Crypto Paper Trading API", default_response_class=DefaultJSONResponse)
 
 
 # Health check endpoint
@@ -247,6 +248,15 @@ def on_startup():
                     )
                     logger.info("Migration completed: Kraken keys migrated to Binance keys")
 
+            # create_all() does not add indexes to tables that already exist
+            db.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_accounts_active_type ON accounts (account_type) "
+                    "WHERE is_active = 'true'"
+                )
+            )
+            db.execute(text("CREATE INDEX IF NOT EXISTS ix_trades_account_time ON trades (account_id, trade_time)"))
+
             db.commit()
         except Exception as migration_err:
             db.rollback()
@@ -270,22 +280,17 @@ def on_startup():
         # Delete all non-default users and their accounts
         from database.models import Order, Position, Trade
 
-        non_default_users = db.query(User).filter(User.username != "default").all()
-        for user in non_default_users:
-            # Get user's account IDs
-            account_ids = [acc.id for acc in db.query(Account).filter(Account.user_id == user.id).all()]
-
-            if account_ids:
-                # Delete trades, orders, positions associated with these accounts
-                db.query(Trade).filter(Trade.account_id.in_(account_ids)).delete(synchronize_session=False)
-                db.query(Order).filter(Order.account_id.in_(account_ids)).delete(synchronize_session=False)
-                db.query(Position).filter(Position.account_id.in_(account_ids)).delete(synchronize_session=False)
+        # Set-based deletes: a fixed number of statements regardless of how many users/accounts exist
+        non_default_user_ids = select(User.id).where(User.username != "default")
+        non_default_account_ids = select(Account.id).where(Account.user_id.in_(non_default_user_ids))
 
-                # Now delete the accounts
-                db.query(Account).filter(Account.user_id == user.id).delete(synchronize_session=False)
+        # Delete trades, orders, positions associated with these accounts
+        for model in (Trade, Order, Position):
+            db.execute(delete(model).where(model.account_id.in_(non_default_account_ids)))
 
-            # Delete the user
-            db.delete(user)
+        # Now delete the accounts, then the users
+        db.execute(delete(Account).where(Account.user_id.in_(non_default_user_ids)))
+        db.execute(delete(User).where(User.username != "default"))
 
         db.commit()
 
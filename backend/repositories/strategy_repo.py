@@ -3,21 +3,33 @@ from datetime import datetime, timezone
 from typing import List, Optional
 
 from database.models import AccountStrategyConfig
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# Hot-path statements are built once at import with bound parameters, so each call only binds values
+# and reuses the compiled SQL instead of rebuilding the query
+_GET_BY_ACCOUNT_STMT = select(AccountStrategyConfig).where(
+    AccountStrategyConfig.account_id == bindparam("account_id")
+)
+_LIST_STMT = select(AccountStrategyConfig)
+
+# Single UPDATE; a missing config simply matches no row
+_SET_LAST_TRIGGER_STMT = (
+    update(AccountStrategyConfig)
+    .where(AccountStrategyConfig.account_id == bindparam("target_account_id"))
+    .values(last_trigger_at=bindparam("trigger_time"))
+)
+
 
 def get_strategy_by_account(db: Session, account_id: int) -> Optional[AccountStrategyConfig]:
-    return (
-        db.query(AccountStrategyConfig)
-        .filter(AccountStrategyConfig.account_id == account_id)
-        .first()
-    )
+    return db.execute(_GET_BY_ACCOUNT_STMT, {"account_id": account_id}).scalars().first()
 
 
 def list_strategies(db: Session) -> List[AccountStrategyConfig]:
-    return db.query(AccountStrategyConfig).all()
+    return list(db.execute(_LIST_STMT).scalars())
 
 
 def upsert_strategy(
@@ -28,39 +40,39 @@ def upsert_strategy(
     tick_batch_size: Optional[int] = None,
     enabled: bool = True,
 ) -> AccountStrategyConfig:
-    strategy = get_strategy_by_account(db, account_id)
-    if strategy is None:
-        logger.info(f"[STRATEGY_REPO] Creating new strategy config for account {account_id}")
-        strategy = AccountStrategyConfig(account_id=account_id)
-        db.add(strategy)
-    else:
-        logger.info(f"[STRATEGY_REPO] Updating existing strategy config for account {account_id}")
-
-    old_trigger_mode = strategy.trigger_mode
-    old_interval_seconds = strategy.interval_seconds
-    old_tick_batch_size = strategy.tick_batch_size
-    old_enabled = strategy.enabled
+    values = {
+        "trigger_mode": trigger_mode,
+        "interval_seconds": interval_seconds,
+        "tick_batch_size": tick_batch_size,
+        "enabled": "true" if enabled else "false",
+    }
+    logger.info(f"[STRATEGY_REPO] Upserting strategy config for account {account_id}: trigger_mode={trigger_mode}, interval_seconds={interval_seconds}, tick_batch_size={tick_batch_size}, enabled={values['enabled']}")
 
-    strategy.trigger_mode = trigger_mode
-    strategy.interval_seconds = interval_seconds
-    strategy.tick_batch_size = tick_batch_size
-    strategy.enabled = "true" if enabled else "false"
-
-    logger.info(f"[STRATEGY_REPO] Strategy changes: trigger_mode={old_trigger_mode}->{trigger_mode}, interval_seconds={old_interval_seconds}->{interval_seconds}, tick_batch_size={old_tick_batch_size}->{tick_batch_size}, enabled={old_enabled}->{strategy.enabled}")
+    # One INSERT ... ON CONFLICT(account_id) DO UPDATE instead of SELECT-then-INSERT/UPDATE;
+    # RETURNING hands back the stored row
+    stmt = (
+        sqlite_insert(AccountStrategyConfig)
+        .values(account_id=account_id, **values)
+        .on_conflict_do_update(
+            index_elements=[AccountStrategyConfig.account_id],
+            set_={**values, "updated_at": func.current_timestamp()},
+        )
+        .returning(AccountStrategyConfig)
+    )
+    strategy = db.execute(stmt, execution_options={"populate_existing": True}).scalar_one()
+    # RETURNING already loaded every column (server defaults included); detach the row so the commit
+    # does not expire it and the next attribute access doesn't SELECT it again
+    db.expunge(strategy)
 
     db.commit()
-    db.refresh(strategy)
-    
-    logger.info(f"[STRATEGY_REPO] Strategy committed and refreshed: trigger_mode={strategy.trigger_mode}, enabled={strategy.enabled}")
+
+    logger.info(f"[STRATEGY_REPO] Strategy committed: trigger_mode={strategy.trigger_mode}, enabled={strategy.enabled}")
     return strategy
 
 
 def set_last_trigger(db: Session, account_id: int, when) -> None:
-    strategy = get_strategy_by_account(db, account_id)
-    if not strategy:
-        return
     when_to_store = when
     if isinstance(when, datetime) and when.tzinfo is not None:
         when_to_store = when.astimezone(timezone.utc).replace(tzinfo=None)
-    strategy.last_trigger_at = when_to_store
+    db.execute(_SET_LAST_TRIGGER_STMT, {"target_account_id": account_id, "trigger_time": when_to_store})
     db.commit()
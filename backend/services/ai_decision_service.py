@@ -12,7 +12,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
-import requests
+import httpx
 from database.models import Account, AIDecisionLog
 from repositories import prompt_repo
 from repositories.strategy_repo import set_last_trigger
@@ -21,6 +21,7 @@ from repositories.strategy_repo import set_last_trigger
 # Note: api.ws imports scheduler, scheduler imports trading_commands, trading_commands imports ai_decision_service
 from services.broker_adapter import get_balance_and_positions
 from services.market_data import get_last_price
+from services.json_utils import loads as json_loads
 from services.news_feed import fetch_latest_news
 from services.system_logger import system_logger
 from sqlalchemy.orm import Session
@@ -34,6 +35,16 @@ import os
 
 ENABLE_SSL_VERIFICATION = os.getenv("ENABLE_SSL_VERIFICATION", "false").lower() == "true"
 
+# Shared pooled HTTP client for AI API calls so decision cycles reuse keep-alive
+# connections (and TLS sessions) instead of reconnecting on every request
+_ai_http_client = httpx.Client(
+    verify=ENABLE_SSL_VERIFICATION,
+    timeout=httpx.Timeout(30.0),
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    # requests.post followed redirects; keep that for base_urls that redirect (http -> https, trailing slash)
+    follow_redirects=True,
+)
+
 #  mode API keys that should be skipped
 DEMO_API_KEYS = {"default-key-please-update-in-settings", "default", "", None}
 
@@ -294,27 +305,28 @@ def _extract_text_from_message(content: Any) -> str:
 
     if isinstance(content, list):
         parts: List[str] = []
+        append = parts.append
+        # Decoded JSON only holds plain str/dict/list, so exact type checks are enough here
         for item in content:
-            if isinstance(item, str):
-                parts.append(item)
-            elif isinstance(item, dict):
+            item_type = type(item)
+            if item_type is str:
+                append(item)
+            elif item_type is dict:
                 # Anthropic style: {"type": "text", "text": "..."}
                 text_value = item.get("text")
-                if isinstance(text_value, str):
-                    parts.append(text_value)
+                if type(text_value) is str:
+                    append(text_value)
                     continue
 
-                # Some providers use {"type": "output_text", "content": "..."}
+                # Some providers use {"type": "output_text", "content": "..."};
+                # otherwise recurse into nested content arrays
                 content_value = item.get("content")
-                if isinstance(content_value, str):
-                    parts.append(content_value)
-                    continue
-
-                # Recursively handle nested content arrays
-                nested = item.get("content")
-                nested_text = _extract_text_from_message(nested)
-                if nested_text:
-                    parts.append(nested_text)
+                if type(content_value) is str:
+                    append(content_value)
+                elif content_value is not None:
+                    nested_text = _extract_text_from_message(content_value)
+                    if nested_text:
+                        append(nested_text)
         return "\n".join(parts)
 
     if isinstance(content, dict):
@@ -444,12 +456,10 @@ def call_ai_for_decision(
                             "This should only be used for custom endpoints with self-signed certificates."
                         )
 
-                    response = requests.post(
+                    response = _ai_http_client.post(
                         endpoint,
                         headers=headers,
                         json=payload,
-                        timeout=30,
-                        verify=verify_ssl,
                     )
 
                     if response.status_code == 200:
@@ -485,7 +495,7 @@ def call_ai_for_decision(
                         response.text,
                     )
                     break  # Try next endpoint if available
-                except requests.RequestException as req_err:
+                except httpx.HTTPError as req_err:
                     if attempt < max_retries - 1:
                         wait_time = (2**attempt) + random.uniform(0, 1)
                         logger.warning(
@@ -523,7 +533,7 @@ def call_ai_for_decision(
             )
             return None
 
-        result = response.json()
+        result = json_loads(response.content)
 
         # Extract text from OpenAI-compatible response format
         if "choices" in result and len(result["choices"]) > 0:
@@ -623,7 +633,7 @@ def call_ai_for_decision(
         logger.error(f"Unexpected AI response format: {result}")
         return None
 
-    except requests.RequestException as err:
+    except httpx.HTTPError as err:
         logger.error(f"AI API request failed: {err}")
         return None
     except json.JSONDecodeError as err:
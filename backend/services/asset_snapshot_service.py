@@ -5,33 +5,132 @@ Record account asset snapshots on price updates.
 from __future__ import annotations
 
 import logging
-from collections import defaultdict
+import threading
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from concurrent.futures import Future
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 # Dynamic import to avoid circular dependency with api.ws
 # Note: api.ws imports scheduler, scheduler may import services that import asset_snapshot_service
-from database.connection import SessionLocal
+from database.connection import ReadSessionLocal, SessionLocal
 from database.models import Account, AccountAssetSnapshot
 from services.asset_curve_calculator import invalidate_asset_curve_cache
-from services.broker_adapter import get_balance_and_positions
-from services.market_data import get_last_price
+from services.broker_adapter import submit_balance_and_positions
+from services.market_data import get_last_prices_bulk
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 SNAPSHOT_RETENTION_HOURS = 24 * 30  # Keep 30 days of asset snapshots
+ACTIVE_ACCOUNTS_CACHE_TTL_SECONDS = 5.0  # Accounts change rarely; reuse the list across price ticks
+SNAPSHOT_PURGE_INTERVAL_SECONDS = 3600  # Expired snapshots are purged at most this often, not on every tick
+
+# Only the account columns snapshots and the broker read; rows expose them as attributes like an Account
+_ACTIVE_ACCOUNT_COLUMNS = (
+    Account.id,
+    Account.name,
+    Account.model,
+    Account.binance_api_key,
+    Account.binance_secret_key,
+)
+
+# (monotonic time loaded, account rows)
+_active_accounts_cache: Optional[Tuple[float, List[Row]]] = None
+_active_accounts_lock = threading.Lock()
+
+# Last known Binance (balance, positions) per account; ticks use it while a refresh runs in the background
+_broker_states: Dict[int, Tuple[Optional[Decimal], List[Dict]]] = {}
+_broker_refreshing: Dict[int, Future] = {}
+_broker_states_lock = threading.Lock()
+
+# Monotonic time of the last committed purge (None until the first tick purges)
+_last_purge_at: Optional[float] = None
+
+# Rounded contents of the last arena asset update queued for broadcast; identical ticks are skipped
+_last_broadcast_key: Optional[tuple] = None
+
+
+def invalidate_active_accounts_cache() -> None:
+    """Drop the cached active accounts (call after an account is created or its settings change)."""
+    global _active_accounts_cache
+    with _active_accounts_lock:
+        _active_accounts_cache = None
+
+
+def _get_active_accounts() -> List[Row]:
+    global _active_accounts_cache
+    with _active_accounts_lock:
+        cached = _active_accounts_cache
+    if cached and time.monotonic() - cached[0] < ACTIVE_ACCOUNTS_CACHE_TTL_SECONDS:
+        return cached[1]
 
+    db = ReadSessionLocal()
+    try:
+        accounts = db.execute(
+            select(*_ACTIVE_ACCOUNT_COLUMNS).where(Account.is_active == "true", Account.account_type == "AI")
+        ).all()
+    finally:
+        db.close()
+    with _active_accounts_lock:
+        _active_accounts_cache = (time.monotonic(), accounts)
+    return accounts
+
+
+def _store_broker_state(account_id: int, future: Future) -> None:
+    try:
+        state = future.result()
+    except Exception as fetch_err:
+        # Keep the last known state; the next tick retries
+        logger.debug("Binance refresh failed for account %s: %s", account_id, fetch_err)
+        state = None
+    with _broker_states_lock:
+        if state is not None:
+            _broker_states[account_id] = state
+        _broker_refreshing.pop(account_id, None)
 
-def _get_active_accounts(db: Session) -> List[Account]:
-    return db.query(Account).filter(Account.is_active == "true", Account.account_type == "AI").all()
+
+def _get_broker_states(accounts: List[Row]) -> List[Tuple[Optional[Decimal], List[Dict]]]:
+    """Balance and positions per account without waiting on Binance once an account has been seen.
+
+    Every tick starts a background refresh (at most one in flight per account; the Binance client's own
+    TTL cache absorbs the rest) and values the accounts with their last known state. Only accounts that
+    have never been fetched wait for their first result.
+    """
+    started: Dict[int, Future] = {}
+    with _broker_states_lock:
+        for account in accounts:
+            if account.id not in _broker_refreshing:
+                started[account.id] = _broker_refreshing[account.id] = submit_balance_and_positions(account)
+        known = {account.id: _broker_states.get(account.id) for account in accounts}
+        in_flight = {account.id: _broker_refreshing.get(account.id) for account in accounts}
+    # Outside the lock: a future that already finished runs its callback right here
+    for account_id, future in started.items():
+        future.add_done_callback(lambda fut, account_id=account_id: _store_broker_state(account_id, fut))
+
+    states = []
+    for account in accounts:
+        state = known[account.id]
+        future = in_flight[account.id]
+        if state is None and future is not None:
+            try:
+                state = future.result()
+            except Exception:
+                state = None
+        states.append(state or (None, []))
+    return states
 
 
 def handle_price_update(event: Dict[str, Any]) -> None:
     """Persist account asset snapshots based on the latest price event."""
+    global _last_purge_at, _last_broadcast_key
     session = SessionLocal()
     try:
-        accounts = _get_active_accounts(session)
+        accounts = _get_active_accounts()
         if not accounts:
             return
 
@@ -39,55 +138,64 @@ def handle_price_update(event: Dict[str, Any]) -> None:
         trigger_market = event.get("market", "CRYPTO")
         event_time: datetime = event.get("event_time") or datetime.now(tz=timezone.utc)
 
-        snapshots: List[AccountAssetSnapshot] = []
-        symbol_totals = defaultdict(float)
+        snapshot_rows: List[Dict[str, Any]] = []
         accounts_payload: List[Dict[str, Any]] = []
         total_available_cash = 0.0
         total_frozen_cash = 0.0
         total_positions_value = 0.0
-        price_cache: Dict[str, float] = {}
 
-        for account in accounts:
-            try:
-                # Get balance and positions from Binance in real-time (single API call)
-                # This ensures we use the actual current positions, not stale database records
+        # Balance and positions come from Binance (not stale database records), refreshed in the background
+        broker_states = _get_broker_states(accounts)
+
+        # Positions overlap heavily across accounts: price every distinct symbol once, in one batch
+        # (Binance positions are always CRYPTO)
+        needed = {
+            ((pos.get("symbol") or "").upper(), "CRYPTO")
+            for _, positions_data in broker_states
+            for pos in positions_data
+            if pos.get("symbol")
+        }
+        price_cache = get_last_prices_bulk(needed) if needed else {}
+
+        # Flatten every priced position into parallel arrays, then value them all at once
+        symbol_ids: Dict[str, int] = {}
+        account_idx: List[int] = []
+        symbol_idx: List[int] = []
+        quantities: List[float] = []
+        prices: List[float] = []
+        for index, (account, (_, positions_data)) in enumerate(zip(accounts, broker_states)):
+            for pos in positions_data:
+                symbol_key = (pos.get("symbol") or "").upper()
+                if not symbol_key:
+                    continue
+                price = price_cache.get((symbol_key, "CRYPTO"))
+                if price is None:
+                    logger.debug("Skipping valuation for %s.CRYPTO: no price available", symbol_key)
+                    continue
                 try:
-                    balance, positions_data = get_balance_and_positions(account)
-                    available_cash = float(balance) if balance is not None else 0.0
-                except Exception:
-                    available_cash = 0.0
-                    positions_data = []
+                    quantity = float(pos.get("quantity", 0) or 0)
+                except (TypeError, ValueError):
+                    logger.warning("Skipping %s position for account %s: bad quantity", symbol_key, account.name)
+                    continue
+                account_idx.append(index)
+                symbol_idx.append(symbol_ids.setdefault(symbol_key, len(symbol_ids)))
+                quantities.append(quantity)
+                prices.append(float(price))
 
-                frozen_cash = 0.0  # Not tracked - all data from Binance
+        values = np.asarray(quantities, dtype=np.float64) * np.asarray(prices, dtype=np.float64)
+        account_values = np.bincount(
+            np.asarray(account_idx, dtype=np.intp), weights=values, minlength=len(accounts)
+        ).tolist()
+        symbol_values = np.bincount(
+            np.asarray(symbol_idx, dtype=np.intp), weights=values, minlength=len(symbol_ids)
+        ).tolist()
+        symbol_totals = dict(zip(symbol_ids, symbol_values))
 
-                # Calculate positions value from Binance real-time data
-                positions_value = 0.0
-                for pos in positions_data:
-                    symbol_key = (pos.get("symbol") or "").upper()
-                    if not symbol_key:
-                        continue
-                    market_key = "CRYPTO"  # Binance positions are always CRYPTO
-                    cache_key = f"{symbol_key}.{market_key}"
-
-                    try:
-                        if cache_key in price_cache:
-                            price = price_cache[cache_key]
-                        else:
-                            price = float(get_last_price(symbol_key, market_key))
-                            price_cache[cache_key] = price
-                    except Exception as price_err:
-                        logger.debug(
-                            "Skipping valuation for %s.%s: %s",
-                            symbol_key,
-                            market_key,
-                            price_err,
-                        )
-                        continue
+        for account, (balance, _), positions_value in zip(accounts, broker_states, account_values):
+            try:
+                available_cash = float(balance) if balance is not None else 0.0
 
-                    quantity = float(pos.get("quantity", 0) or 0)
-                    current_value = price * quantity
-                    positions_value += current_value
-                    symbol_totals[symbol_key] += current_value
+                frozen_cash = 0.0  # Not tracked - all data from Binance
 
                 total_assets = positions_value + available_cash
 
@@ -107,16 +215,17 @@ def handle_price_update(event: Dict[str, Any]) -> None:
                     }
                 )
 
-                snapshot = AccountAssetSnapshot(
-                    account_id=account.id,
-                    total_assets=total_assets,
-                    cash=available_cash,
-                    positions_value=positions_value,
-                    trigger_symbol=trigger_symbol,
-                    trigger_market=trigger_market,
-                    event_time=event_time,
+                snapshot_rows.append(
+                    {
+                        "account_id": account.id,
+                        "total_assets": total_assets,
+                        "cash": available_cash,
+                        "positions_value": positions_value,
+                        "trigger_symbol": trigger_symbol,
+                        "trigger_market": trigger_market,
+                        "event_time": event_time,
+                    }
                 )
-                snapshots.append(snapshot)
             except Exception as account_err:
                 logger.warning(
                     "Failed to compute snapshot for account %s: %s",
@@ -124,36 +233,57 @@ def handle_price_update(event: Dict[str, Any]) -> None:
                     account_err,
                 )
 
-        if snapshots:
-            session.bulk_save_objects(snapshots)
-            session.commit()
+        # Insert the snapshot rows and, when due, purge expired ones in a single transaction (one commit)
+        if snapshot_rows:
+            session.execute(AccountAssetSnapshot.__table__.insert(), snapshot_rows)
+        now = time.monotonic()
+        purge_due = _last_purge_at is None or now - _last_purge_at >= SNAPSHOT_PURGE_INTERVAL_SECONDS
+        if purge_due:
+            _purge_old_snapshots(session, cutoff_hours=SNAPSHOT_RETENTION_HOURS)
+        session.commit()
+        if purge_due:
+            _last_purge_at = now
+        if snapshot_rows:
             invalidate_asset_curve_cache()
 
         # Use dynamic import to avoid circular dependency with api.ws
         try:
-            from api.ws import broadcast_arena_asset_update, manager
-
-            if manager.has_connections():
-                update_payload = {
-                    "generated_at": event_time.isoformat(),
-                    "totals": {
-                        "available_cash": round(total_available_cash, 2),
-                        "frozen_cash": round(total_frozen_cash, 2),
-                        "positions_value": round(total_positions_value, 2),
-                        "total_assets": round(total_available_cash + total_frozen_cash + total_positions_value, 2),
-                    },
-                    "symbols": {symbol: round(value, 2) for symbol, value in symbol_totals.items()},
-                    "accounts": accounts_payload,
-                }
-                try:
-                    manager.schedule_task(broadcast_arena_asset_update(update_payload))
-                except Exception as broadcast_err:
-                    logger.debug("Failed to schedule arena asset broadcast: %s", broadcast_err)
+            from api.ws import manager, queue_arena_asset_update
+
+            if not manager.has_connections():
+                # Whoever connects next gets the first update in full
+                _last_broadcast_key = None
+                return
+
+            totals = {
+                "available_cash": round(total_available_cash, 2),
+                "frozen_cash": round(total_frozen_cash, 2),
+                "positions_value": round(total_positions_value, 2),
+                "total_assets": round(total_available_cash + total_frozen_cash + total_positions_value, 2),
+            }
+            symbols = {symbol: round(value, 2) for symbol, value in symbol_totals.items()}
+            # Everything but generated_at; accounts joining or leaving change it too
+            broadcast_key = (
+                tuple(totals.values()),
+                tuple(sorted(symbols.items())),
+                tuple(tuple(entry.values()) for entry in accounts_payload),
+            )
+            if broadcast_key == _last_broadcast_key:
+                return
+            update_payload = {
+                "generated_at": event_time.isoformat(),
+                "totals": totals,
+                "symbols": symbols,
+                "accounts": accounts_payload,
+            }
+            try:
+                queue_arena_asset_update(update_payload)
+                _last_broadcast_key = broadcast_key
+            except Exception as broadcast_err:
+                logger.debug("Failed to schedule arena asset broadcast: %s", broadcast_err)
         except ImportError:
             # If api.ws is not available, skip broadcast
             pass
-
-        _purge_old_snapshots(session, cutoff_hours=SNAPSHOT_RETENTION_HOURS)
     except Exception as err:
         session.rollback()
         logger.error("Failed to record asset snapshots: %s", err)
@@ -162,7 +292,7 @@ def handle_price_update(event: Dict[str, Any]) -> None:
 
 
 def _purge_old_snapshots(session: Session, cutoff_hours: int) -> None:
-    """Remove snapshots older than retention window to control storage."""
+    """Remove snapshots older than retention window to control storage; the caller commits."""
     cutoff_time = datetime.now(tz=timezone.utc) - timedelta(hours=cutoff_hours)
     deleted = (
         session.query(AccountAssetSnapshot)
@@ -170,5 +300,4 @@ def _purge_old_snapshots(session: Session, cutoff_hours: int) -> None:
         .delete(synchronize_session=False)
     )
     if deleted:
-        session.commit()
         logger.debug("Purged %d old asset snapshots", deleted)
@@ -5,24 +5,37 @@ Synchronizes account balance, positions, and orders from Binance API
 
 import hashlib
 import hmac
-import json
 import logging
 import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
 from decimal import Decimal
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+import requests
 from database.models import Account
+from requests.adapters import HTTPAdapter
+from services.json_utils import loads as json_loads
 
 logger = logging.getLogger(__name__)
 
 # Binance API base URL
 BINANCE_API_BASE_URL = "https://api.binance.com"
 
+# Constants for API rate limiting and caching (re-exported by services.trading_commands)
+CACHE_TTL_SECONDS = 5.0  # Cache TTL for balance and positions (seconds)
+RATE_LIMIT_INTERVAL_SECONDS = 10.0  # Minimum interval between Binance API calls (seconds)
+
+# Stablecoin balances counted as cash rather than positions
+_USD_ASSETS = frozenset(("USDT", "BUSD"))
+
+# Shared session so every Binance call reuses a keep-alive TLS connection instead of a new handshake per request
+# (sized for the broker executor's worker threads)
+_binance_session = requests.Session()
+_binance_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=0))
+
 # Thread-safe cache for balance and positions
 _cache_lock = threading.Lock()
 _balance_positions_cache: Dict[str, tuple] = {}
@@ -70,21 +83,17 @@ def _make_signed_request(
     # Build URL
     url = f"{BINANCE_API_BASE_URL}{endpoint}?{query_string}"
 
-    # Create request
-    req = urllib.request.Request(url, method=method)
-    req.add_header("X-MBX-APIKEY", api_key)
-
     try:
-        with urllib.request.urlopen(req, timeout=10) as response:
-            response_data = response.read().decode("utf-8")
-            return json.loads(response_data)
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode("utf-8")
-        try:
-            error_data = json.loads(error_body)
-            raise Exception(f"Binance API error: {error_data.get('msg', error_body)}")
-        except Exception as parse_err:
-            raise Exception(f"Binance API HTTP error {e.code}: {error_body} - {parse_err}")
+        response = _binance_session.request(method, url, headers={"X-MBX-APIKEY": api_key}, timeout=10)
+        if response.status_code >= 400:
+            error_body = response.content.decode("utf-8")
+            try:
+                error_data = json_loads(error_body)
+                raise Exception(f"Binance API error: {error_data.get('msg', error_body)}")
+            except Exception as parse_err:
+                raise Exception(f"Binance API HTTP error {response.status_code}: {error_body} - {parse_err}")
+        # Parse the raw body bytes directly; decoding to str first would copy the whole payload again
+        return json_loads(response.content)
     except Exception as e:
         raise Exception(f"Failed to make Binance API request: {str(e)}")
 
@@ -107,16 +116,16 @@ def _make_public_request(endpoint: str, params: Optional[Dict] = None) -> Dict:
     url = f"{BINANCE_API_BASE_URL}{endpoint}?{query_string}" if query_string else f"{BINANCE_API_BASE_URL}{endpoint}"
 
     try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            response_data = response.read().decode("utf-8")
-            return json.loads(response_data)
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode("utf-8")
-        try:
-            error_data = json.loads(error_body)
-            raise Exception(f"Binance API error: {error_data.get('msg', error_body)}")
-        except Exception as parse_err:
-            raise Exception(f"Binance API HTTP error {e.code}: {error_body}")
+        response = _binance_session.get(url, timeout=10)
+        if response.status_code >= 400:
+            error_body = response.content.decode("utf-8")
+            try:
+                error_data = json_loads(error_body)
+                raise Exception(f"Binance API error: {error_data.get('msg', error_body)}")
+            except Exception as parse_err:
+                raise Exception(f"Binance API HTTP error {response.status_code}: {error_body}")
+        # Parse the raw body bytes directly; decoding to str first would copy the whole payload again
+        return json_loads(response.content)
     except Exception as e:
         raise Exception(f"Failed to make Binance API request: {str(e)}")
 
@@ -125,8 +134,6 @@ def _apply_rate_limiting() -> None:
     """Apply rate limiting for Binance API calls"""
     global _global_binance_last_call_time
 
-    from services.trading_commands import RATE_LIMIT_INTERVAL_SECONDS
-
     current_time = time.time()
     min_interval = RATE_LIMIT_INTERVAL_SECONDS
 
@@ -148,6 +155,17 @@ def _apply_rate_limiting() -> None:
         _global_binance_last_call_time = current_time
 
 
+# Both mappings run per order on a small, fixed set of symbols, so they are memoized
+@lru_cache(maxsize=256)
+def _base_asset(pair: str) -> str:
+    """Strip the quote currency suffix from a Binance pair (e.g., "BTCUSDT" -> "BTC")."""
+    for quote in ("USDT", "BUSD"):
+        if pair.endswith(quote):
+            return pair.removesuffix(quote)
+    return pair
+
+
+@lru_cache(maxsize=256)
 def map_symbol_to_binance_pair(symbol: str) -> str:
     """
     Map internal symbol to Binance trading pair.
@@ -173,9 +191,6 @@ def get_binance_balance_and_positions(account: Account) -> Tuple[Optional[Decima
         return None, []
 
     # Cache mechanism
-    import hashlib
-    from services.trading_commands import CACHE_TTL_SECONDS
-
     api_key_hash = hashlib.md5(account.binance_api_key.encode()).hexdigest()[:8]
     cache_key = f"binance_{account.id}_{api_key_hash}"
     cache_ttl = CACHE_TTL_SECONDS
@@ -199,8 +214,13 @@ def get_binance_balance_and_positions(account: Account) -> Tuple[Optional[Decima
 
     try:
         # Get account information (includes balances)
+        # Without omitZeroBalances Binance lists every asset it supports, almost all of them zero, and each one
+        # would be parsed into Decimals below just to be discarded
         account_info = _make_signed_request(
-            api_key=account.binance_api_key, secret_key=account.binance_secret_key, endpoint="/api/v3/account"
+            api_key=account.binance_api_key,
+            secret_key=account.binance_secret_key,
+            endpoint="/api/v3/account",
+            params={"omitZeroBalances": "true"},
         )
 
         # Extract balances
@@ -216,7 +236,7 @@ def get_binance_balance_and_positions(account: Account) -> Tuple[Optional[Decima
             locked = Decimal(balance_info.get("locked", "0"))
             total = free + locked
 
-            if asset == "USDT" or asset == "BUSD":
+            if asset in _USD_ASSETS:
                 usdt_balance += total
             elif total > Decimal("0"):
                 # This is a position (non-zero balance in a non-stablecoin asset)
@@ -238,20 +258,6 @@ def get_binance_balance_and_positions(account: Account) -> Tuple[Optional[Decima
         logger.debug(f"Fetched Binance balance: ${usdt_balance:.2f}, positions: {len(positions)}")
         return balance, positions
 
-    except urllib.error.HTTPError as e:
-        if e.code == 401:
-            logger.error(
-                f"Binance API authentication failed (401 Unauthorized) for account {account.name}. Please check if the API key and secret key are correct and have proper permissions."
-            )
-        elif e.code == 403:
-            logger.error(f"Binance API forbidden (403) for account {account.name}. Please check API key permissions.")
-        elif e.code == 451:
-            logger.error(
-                f"Binance API unavailable (451) for account {account.name}. Service unavailable from restricted location. Please check Binance terms of service."
-            )
-        else:
-            logger.error(f"Binance API HTTP error {e.code} for account {account.name}: {e}", exc_info=True)
-        return None, []
     except Exception as e:
         logger.error(f"Failed to get balance and positions from Binance for account {account.name}: {e}", exc_info=True)
         return None, []
@@ -278,7 +284,7 @@ def get_binance_open_orders(account: Account) -> List[Dict]:
         for order_info in orders_data:
             symbol = order_info.get("symbol", "")
             # Remove USDT suffix to get base asset
-            base_symbol = symbol.replace("USDT", "").replace("BUSD", "")
+            base_symbol = _base_asset(symbol)
 
             order_id = str(order_info.get("orderId", ""))
             side = order_info.get("side", "").upper()  # BUY or SELL
@@ -300,14 +306,6 @@ def get_binance_open_orders(account: Account) -> List[Dict]:
             )
 
         return orders
-    except urllib.error.HTTPError as e:
-        if e.code == 401:
-            logger.error(f"Binance API authentication failed (401 Unauthorized) for account {account.name}.")
-        elif e.code == 403:
-            logger.error(f"Binance API forbidden (403) for account {account.name}.")
-        else:
-            logger.error(f"Binance API HTTP error {e.code} for account {account.name}: {e}", exc_info=True)
-        return []
     except Exception as e:
         logger.error(f"Failed to get open orders from Binance for account {account.name}: {e}", exc_info=True)
         return []
@@ -341,7 +339,7 @@ def get_binance_closed_orders(account: Account, limit: int = 100) -> List[Dict]:
                 continue
 
             symbol = order_info.get("symbol", "")
-            base_symbol = symbol.replace("USDT", "").replace("BUSD", "")
+            base_symbol = _base_asset(symbol)
 
             order_id = str(order_info.get("orderId", ""))
             side = order_info.get("side", "").upper()
@@ -372,14 +370,6 @@ def get_binance_closed_orders(account: Account, limit: int = 100) -> List[Dict]:
         orders.sort(key=lambda x: x.get("close_time", 0), reverse=True)
         return orders[:limit]
 
-    except urllib.error.HTTPError as e:
-        if e.code == 401:
-            logger.error(f"Binance API authentication failed (401 Unauthorized) for account {account.name}.")
-        elif e.code == 403:
-            logger.error(f"Binance API forbidden (403) for account {account.name}.")
-        else:
-            logger.error(f"Binance API HTTP error {e.code} for account {account.name}: {e}", exc_info=True)
-        return []
     except Exception as e:
         logger.error(f"Failed to get closed orders from Binance for account {account.name}: {e}", exc_info=True)
         return []
@@ -541,15 +531,6 @@ def execute_binance_order(
             logger.warning(f"Binance order response missing orderId: {result}")
             return False, "Missing order ID in response", result
 
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode("utf-8")
-        try:
-            error_data = json.loads(error_body)
-            error_msg = error_data.get("msg", error_body)
-        except Exception as parse_err:
-            error_msg = f"HTTP error {e.code}: {error_body}"
-        logger.error(f"Failed to execute Binance order: {error_msg}", exc_info=True)
-        return False, error_msg, None
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Failed to execute Binance order: {error_msg}", exc_info=True)
@@ -600,15 +581,6 @@ def cancel_binance_order(
         logger.info(f"Binance order cancelled successfully: orderId={order_id}")
         return True, None, result
 
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode("utf-8")
-        try:
-            error_data = json.loads(error_body)
-            error_msg = error_data.get("msg", error_body)
-        except Exception as parse_err:
-            error_msg = f"HTTP error {e.code}: {error_body} - {parse_err}"
-        logger.error(f"Failed to cancel Binance order: {error_msg}", exc_info=True)
-        return False, error_msg, None
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Failed to cancel Binance order: {error_msg}", exc_info=True)
@@ -12,10 +12,15 @@ from typing import Dict, List, Optional, Tuple
 from database.models import Account
 
 from .broker_factory import get_broker
+from .overview_cache import invalidate_account_overview
 
 # Thread pool executor for running synchronous broker calls in async contexts
 # This prevents blocking the async event loop
-_executor = concurrent.futures.ThreadPoolExecutor(max_workers=10, thread_name_prefix="broker_executor")
+# Sized so the 16 concurrent WebSocket snapshot refreshes (api.ws.SNAPSHOT_CONCURRENCY) all run in parallel
+BROKER_EXECUTOR_WORKERS = 16
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=BROKER_EXECUTOR_WORKERS, thread_name_prefix="broker_executor"
+)
 
 
 def get_balance(account: Account) -> Optional[Decimal]:
@@ -70,6 +75,19 @@ def get_balance_and_positions(account: Account) -> Tuple[Optional[Decimal], List
     return broker.get_balance_and_positions(account)
 
 
+def submit_balance_and_positions(account: Account) -> concurrent.futures.Future:
+    """
+    Start fetching balance and positions on the broker executor without waiting for it.
+
+    Args:
+        account: Account object
+
+    Returns:
+        Future resolving to (balance, positions)
+    """
+    return _executor.submit(get_balance_and_positions, account)
+
+
 def get_open_orders(account: Account) -> List[Dict]:
     """
     Get open orders - uses broker interface.
@@ -123,7 +141,9 @@ def execute_order(
     broker = get_broker(account)
     if not broker:
         return False, "Broker not available for account", None
-    return broker.execute_order(account, symbol, side, quantity, price, ordertype)
+    result = broker.execute_order(account, symbol, side, quantity, price, ordertype)
+    invalidate_account_overview(account.id)
+    return result
 
 
 def cancel_order(account: Account, order_id: str) -> Tuple[bool, Optional[str], Optional[Dict]]:
@@ -140,7 +160,9 @@ def cancel_order(account: Account, order_id: str) -> Tuple[bool, Optional[str],
     broker = get_broker(account)
     if not broker:
         return False, "Broker not available for account", None
-    return broker.cancel_order(account, order_id)
+    result = broker.cancel_order(account, order_id)
+    invalidate_account_overview(account.id)
+    return result
 
 
 # ============================================================================
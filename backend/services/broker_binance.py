@@ -70,7 +70,8 @@ class BinanceBroker(BrokerInterface):
             return False, "Binance API keys not configured", None
         
         # For Binance, we need the symbol to cancel the order
-        # Try to find it from open orders first
+        # Only open orders can be cancelled, so that is the only list worth fetching: looking the order up in
+        # closed orders cost another rate-limited request just to send a cancel Binance would reject anyway
         open_orders = self.get_open_orders(account)
         symbol = None
         for order in open_orders:
@@ -78,14 +79,6 @@ class BinanceBroker(BrokerInterface):
                 symbol = order.get("symbol")
                 break
         
-        # If not found in open orders, try closed orders (though those can't be cancelled)
-        if not symbol:
-            closed_orders = self.get_closed_orders(account, limit=100)
-            for order in closed_orders:
-                if str(order.get("order_id")) == str(order_id):
-                    symbol = order.get("symbol")
-                    break
-        
         if not symbol:
             return False, f"Cannot find symbol for order {order_id}. The order may not exist or may already be cancelled.", None
         
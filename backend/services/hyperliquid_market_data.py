@@ -46,6 +46,32 @@ class HyperliquidClient:
             logger.error(f"Error fetching price for {symbol}: {e}")
             return None
 
+    def get_last_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """Get last prices for several symbols with one fetch_tickers call per market type (swap/spot)"""
+        if not self.exchange:
+            self._initialize_exchange()
+
+        formatted = {symbol: self._format_symbol(symbol) for symbol in symbols}
+        # CCXT fetches swap and spot tickers from different endpoints, so group by type
+        swap_symbols = sorted({f for f in formatted.values() if ':' in f})
+        spot_symbols = sorted({f for f in formatted.values() if ':' not in f})
+
+        tickers: Dict[str, Any] = {}
+        for group in (swap_symbols, spot_symbols):
+            if not group:
+                continue
+            try:
+                tickers.update(self.exchange.fetch_tickers(group))
+            except Exception as e:
+                logger.error(f"Error fetching tickers for {group}: {e}")
+
+        prices: Dict[str, Optional[float]] = {}
+        for symbol, formatted_symbol in formatted.items():
+            last = (tickers.get(formatted_symbol) or {}).get('last')
+            prices[symbol] = float(last) if last else None
+        logger.info(f"Got prices for {len(prices)} symbols in one batch")
+        return prices
+
     def get_kline_data(self, symbol: str, period: str = '1d', count: int = 100) -> List[Dict[str, Any]]:
         """Get kline/candlestick data for a symbol"""
         try:
@@ -196,6 +222,11 @@ def get_last_price_from_hyperliquid(symbol: str) -> Optional[float]:
     return hyperliquid_client.get_last_price(symbol)
 
 
+def get_last_prices_from_hyperliquid(symbols: List[str]) -> Dict[str, Optional[float]]:
+    """Get last prices for several symbols from Hyperliquid in one batch"""
+    return hyperliquid_client.get_last_prices(symbols)
+
+
 def get_kline_data_from_hyperliquid(symbol: str, period: str = '1d', count: int = 100) -> List[Dict[str, Any]]:
     """Get kline data from Hyperliquid"""
     return hyperliquid_client.get_kline_data(symbol, period, count)
@@ -0,0 +1,61 @@
+"""
+JSON helpers that use orjson when it is installed and fall back to the stdlib otherwise.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Union
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+# Response class for API routers: ORJSONResponse asserts orjson is importable, so only use it when it is
+DefaultJSONResponse = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """Encode types neither serializer handles natively the way the API already does."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize to UTF-8 encoded JSON bytes."""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    def dumps(obj: Any) -> str:
+        """Serialize to a JSON str (UTF-8, non-ASCII kept as-is)."""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode()
+
+else:
+
+    def dumps(obj: Any) -> str:
+        """Serialize to a JSON str (UTF-8, non-ASCII kept as-is)."""
+        return json.dumps(obj, ensure_ascii=False, default=_default)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize to UTF-8 encoded JSON bytes."""
+        return dumps(obj).encode()
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Parse JSON from bytes or str.
+
+    Raises json.JSONDecodeError on invalid input (orjson.JSONDecodeError subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
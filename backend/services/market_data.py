@@ -1,14 +1,32 @@
 import logging
-from typing import Any, Dict, List
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .hyperliquid_market_data import (get_all_symbols_from_hyperliquid,
                                       get_kline_data_from_hyperliquid,
                                       get_last_price_from_hyperliquid,
+                                      get_last_prices_from_hyperliquid,
                                       get_market_status_from_hyperliquid,
                                       hyperliquid_client)
 
 logger = logging.getLogger(__name__)
 
+# Cache lifetime for K-line results per period (a fraction of one bar)
+KLINE_CACHE_TTL_SECONDS: Dict[str, float] = {
+    "1m": 15.0,
+    "5m": 60.0,
+    "15m": 180.0,
+    "1h": 600.0,
+    "4h": 1800.0,
+    "1d": 3600.0,
+}
+DEFAULT_KLINE_CACHE_TTL_SECONDS = 60.0
+
+# In-process K-line cache: (symbol, market, period, count) -> (expires_at, data)
+_KLINE_CACHE: Dict[Tuple[str, str, str, int], Tuple[float, List[Dict[str, Any]]]] = {}
+_KLINE_CACHE_LOCK = threading.Lock()
+
 
 def get_last_price(symbol: str, market: str = "CRYPTO") -> float:
     key = f"{symbol}.{market}"
@@ -35,6 +53,41 @@ def get_last_price(symbol: str, market: str = "CRYPTO") -> float:
         raise Exception(f"Unable to get real-time price for {key}: {hl_err}")
 
 
+def get_last_prices_bulk(pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[float]]:
+    """Latest prices for many (symbol, market) pairs: cache hits first, then one batched upstream call.
+
+    Pairs the batch could not price fall back to get_last_price; failures map to None.
+    """
+    from .price_cache import cache_price, get_cached_prices
+
+    pairs = set(pairs)
+    # The market data stream keeps the cache warm for traded symbols, so this is usually every pair
+    prices: Dict[Tuple[str, str], Optional[float]] = dict(get_cached_prices(pairs))
+    misses: List[Tuple[str, str]] = [pair for pair in pairs if pair not in prices]
+
+    if misses:
+        try:
+            # All markets are served by Hyperliquid, so every miss goes in one batch
+            batch = get_last_prices_from_hyperliquid([symbol for symbol, _ in misses])
+        except Exception as hl_err:
+            logger.error(f"Batched price fetch failed, falling back to per-symbol: {hl_err}")
+            batch = {}
+
+        for symbol, market in misses:
+            price = batch.get(symbol)
+            if price and price > 0:
+                cache_price(symbol, market, price)
+            else:
+                try:
+                    price = get_last_price(symbol, market)
+                except Exception as e:
+                    logger.warning(f"Failed to get price for {symbol}.{market}: {e}")
+                    price = None
+            prices[(symbol, market)] = price
+
+    return prices
+
+
 def get_kline_data(symbol: str, market: str = "CRYPTO", period: str = "1d", count: int = 100) -> List[Dict[str, Any]]:
     key = f"{symbol}.{market}"
 
@@ -49,6 +102,26 @@ def get_kline_data(symbol: str, market: str = "CRYPTO", period: str = "1d", coun
         raise Exception(f"Unable to get K-line data for {key}: {hl_err}")
 
 
+def get_cached_kline_data(
+    symbol: str, market: str = "CRYPTO", period: str = "1d", count: int = 100
+) -> List[Dict[str, Any]]:
+    """Same as get_kline_data, but reuses recent results so repeated callers share one upstream fetch"""
+    cache_key = (symbol, market, period, count)
+    now = time.monotonic()
+
+    with _KLINE_CACHE_LOCK:
+        entry = _KLINE_CACHE.get(cache_key)
+        if entry and entry[0] > now:
+            logger.debug(f"Using cached K-line data for {symbol}.{market} ({period}, {count})")
+            return entry[1]
+
+    data = get_kline_data(symbol, market, period, count)
+    ttl = KLINE_CACHE_TTL_SECONDS.get(period, DEFAULT_KLINE_CACHE_TTL_SECONDS)
+    with _KLINE_CACHE_LOCK:
+        _KLINE_CACHE[cache_key] = (now + ttl, data)
+    return data
+
+
 def get_market_status(symbol: str, market: str = "CRYPTO") -> Dict[str, Any]:
     key = f"{symbol}.{market}"
 
@@ -7,11 +7,16 @@ from html import unescape
 from typing import List
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
 NEWS_FEED_URL = "https://coinjournal.net/news/feed/"
 
+# Shared session so every AI decision cycle reuses the keep-alive TLS connection to the feed host
+_news_session = requests.Session()
+_news_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=0))
+
 
 def _strip_html_tags(text: str) -> str:
     if not text:
@@ -23,7 +28,7 @@ def _strip_html_tags(text: str) -> str:
 
 def fetch_latest_news(max_chars: int = 4000) -> str:
     try:
-        response = requests.get(NEWS_FEED_URL, timeout=10)
+        response = _news_session.get(NEWS_FEED_URL, timeout=10)
         if response.status_code != 200:
             logger.warning("Failed to fetch news feed: status %s", response.status_code)
             return ""
@@ -26,6 +26,7 @@ from repositories.position_repo import list_positions
 
 from .broker_adapter import get_balance_and_positions
 from .market_data import get_last_price
+from .overview_cache import invalidate_account_overview
 
 # Dynamic imports to avoid circular import with api.ws
 # Note: api.ws imports order_matching.create_order, so we import ws functions dynamically
@@ -431,6 +432,7 @@ def _execute_order(db: Session, order: Order, account: Account, execution_price:
         order.status = "FILLED"
 
         db.commit()
+        invalidate_account_overview(order.account_id)
 
         logger.info(f"Order {order.order_no} executed: {order.side} {quantity} {order.symbol} @ {execution_price} USDT")
 
@@ -607,6 +609,7 @@ def cancel_order(db: Session, order: Order, reason: str = "User cancelled") -> b
         if account:
             _release_frozen_on_cancel(account, order)
         db.commit()
+        invalidate_account_overview(order.account_id)
 
         logger.info(f"Order {order.order_no} cancelled: {reason}")
         return True
@@ -6,7 +6,6 @@ Background task for periodically processing pending orders
 import asyncio
 import logging
 import threading
-import time
 from typing import Optional
 
 from database.connection import SessionLocal
@@ -71,8 +70,9 @@ class OrderScheduler:
                     
             except Exception as e:
                 logger.error(f"Order scheduler execution error: {e}")
-                # Wait briefly after error to avoid rapid looping
-                time.sleep(1)
+                # Wait briefly after error to avoid rapid looping; wake immediately on stop
+                if self._stop_event.wait(timeout=1):
+                    break
         
         logger.info("Order scheduler main loop ended")
     
@@ -0,0 +1,46 @@
+"""
+Short-lived cache of account overview broker data (balance, positions, open orders).
+Lives in the service layer so order and trade mutations can invalidate it after they commit.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Dashboards poll far more often than balances change
+OVERVIEW_CACHE_TTL_SECONDS = 1.0
+
+# account_id -> (monotonic expiry, data)
+_overview_cache: Dict[int, Tuple[float, tuple]] = {}
+# account_id -> invalidation count, so a fetch that straddles an invalidation cannot store stale data
+_overview_generations: Dict[int, int] = {}
+_overview_cache_lock = threading.Lock()
+
+
+def get_cached_overview(account_id: int) -> Optional[tuple]:
+    """Return cached overview data for an account if still within TTL."""
+    with _overview_cache_lock:
+        entry = _overview_cache.get(account_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def overview_generation(account_id: int) -> int:
+    """Current invalidation count for an account; read it before fetching and pass it to cache_overview."""
+    with _overview_cache_lock:
+        return _overview_generations.get(account_id, 0)
+
+
+def cache_overview(account_id: int, data: tuple, generation: int) -> None:
+    """Store freshly fetched overview data unless the account was invalidated since the fetch started."""
+    with _overview_cache_lock:
+        if _overview_generations.get(account_id, 0) == generation:
+            _overview_cache[account_id] = (time.monotonic() + OVERVIEW_CACHE_TTL_SECONDS, data)
+
+
+def invalidate_account_overview(account_id: int) -> None:
+    """Drop cached overview data for an account; call after the change that invalidates it is committed."""
+    with _overview_cache_lock:
+        _overview_cache.pop(account_id, None)
+        _overview_generations[account_id] = _overview_generations.get(account_id, 0) + 1
@@ -11,18 +11,21 @@ from database.connection import SessionLocal
 from database.models import Account, Position
 from services.broker_adapter import get_balance_and_positions
 from services.trading_commands import POSITION_SYNC_THRESHOLD
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 
-def sync_account_positions_with_binance(account: Account, db: Session) -> Dict[str, int]:
+def sync_account_positions_with_binance(account: Account, db: Session, commit: bool = True) -> Dict[str, int]:
     """
     Sync database positions with Binance actual positions for a single account.
 
     Args:
         account: Account to sync
         db: Database session
+        commit: Commit the changes here; with False the caller owns the transaction (e.g. a savepoint) and
+            errors propagate so it can roll that back
 
     Returns:
         Dict with sync statistics: {"synced": count, "removed": count, "added": count}
@@ -46,67 +49,83 @@ def sync_account_positions_with_binance(account: Account, db: Session) -> Dict[s
                     "avg_cost": float(pos.get("avg_cost", 0)),
                 }
 
-        # Get database positions for this account
-        db_positions = db.query(Position).filter(Position.account_id == account.id, Position.market == "CRYPTO").all()
+        # Get database positions for this account (only the columns the comparison needs)
+        db_positions = db.execute(
+            select(Position.id, Position.symbol, Position.quantity, Position.avg_cost).where(
+                Position.account_id == account.id, Position.market == "CRYPTO"
+            )
+        ).all()
 
         synced_count = 0
         removed_count = 0
         added_count = 0
 
+        # Changes are collected here and written with one bulk UPDATE and one DELETE instead of per-row statements
+        position_updates: List[Dict] = []
+        removed_ids: List[int] = []
+
         # Update or remove existing database positions
         for db_pos in db_positions:
             symbol = db_pos.symbol.upper()
 
             if symbol in binance_positions_dict:
                 # Position exists on Binance - sync it
-                binance_pos = binance_positions_dict[symbol]
+                # (removed from the dict to track which positions we've processed)
+                binance_pos = binance_positions_dict.pop(symbol)
 
                 # Only update if there's a significant difference (avoid unnecessary updates)
                 qty_diff = abs(float(db_pos.quantity) - binance_pos["quantity"])
                 if qty_diff > POSITION_SYNC_THRESHOLD:  # Use constant
-                    db_pos.quantity = binance_pos["quantity"]
-                    db_pos.available_quantity = binance_pos["available_quantity"]
-                    # Update avg_cost if available (Binance may not always provide this)
-                    if binance_pos.get("avg_cost", 0) > 0:
-                        db_pos.avg_cost = binance_pos["avg_cost"]
+                    position_updates.append(
+                        {
+                            "id": db_pos.id,
+                            "quantity": binance_pos["quantity"],
+                            "available_quantity": binance_pos["available_quantity"],
+                            # Update avg_cost if available (Binance may not always provide this)
+                            "avg_cost": binance_pos["avg_cost"] if binance_pos["avg_cost"] > 0 else db_pos.avg_cost,
+                        }
+                    )
                     synced_count += 1
                     logger.debug(
                         f"Synced position {symbol} for account {account.name}: "
                         f"DB={db_pos.quantity} -> Binance={binance_pos['quantity']}"
                     )
-                else:
-                    # Position is in sync
-                    pass
-
-                # Remove from dict to track which positions we've processed
-                del binance_positions_dict[symbol]
             else:
                 # Position exists in DB but not on Binance - remove it
                 logger.info(f"Removing position {symbol} from DB (not found on Binance) for account {account.name}")
-                db.delete(db_pos)
+                removed_ids.append(db_pos.id)
                 removed_count += 1
 
-        # Add new positions that exist on Binance but not in DB
+        if position_updates:
+            db.execute(update(Position), position_updates)
+        if removed_ids:
+            db.execute(delete(Position).where(Position.id.in_(removed_ids)))
+
+        # Add new positions that exist on Binance but not in DB (one multi-row INSERT, no ORM objects)
+        new_positions: List[Dict] = []
         for symbol, binance_pos in binance_positions_dict.items():
-            # Find position name (use symbol as fallback)
-            position = Position(
-                version="v1",
-                account_id=account.id,
-                symbol=symbol,
-                name=symbol,  # Use symbol as name if we don't have mapping
-                market="CRYPTO",
-                quantity=binance_pos["quantity"],
-                available_quantity=binance_pos["available_quantity"],
-                avg_cost=binance_pos.get("avg_cost", 0),
+            new_positions.append(
+                {
+                    "version": "v1",
+                    "account_id": account.id,
+                    "symbol": symbol,
+                    "name": symbol,  # Use symbol as name if we don't have mapping
+                    "market": "CRYPTO",
+                    "quantity": binance_pos["quantity"],
+                    "available_quantity": binance_pos["available_quantity"],
+                    "avg_cost": binance_pos.get("avg_cost", 0),
+                }
             )
-            db.add(position)
             added_count += 1
             logger.debug(
                 f"Added new position {symbol} from Binance for account {account.name}: "
                 f"quantity={binance_pos['quantity']}"
             )
+        if new_positions:
+            db.execute(Position.__table__.insert(), new_positions)
 
-        db.commit()
+        if commit:
+            db.commit()
 
         logger.info(
             f"Position sync completed for account {account.name}: "
@@ -120,6 +139,8 @@ def sync_account_positions_with_binance(account: Account, db: Session) -> Dict[s
         }
 
     except Exception as e:
+        if not commit:
+            raise
         db.rollback()
         logger.error(f"Failed to sync positions for account {account.name}: {e}", exc_info=True)
         return {"synced": 0, "removed": 0, "added": 0}
@@ -140,9 +161,13 @@ def sync_all_active_accounts_positions() -> Dict[str, int]:
 
         total_stats = {"synced": 0, "removed": 0, "added": 0}
 
+        # All accounts are written in one transaction and committed once (one WAL sync instead of one per account).
+        # Each account runs in its own savepoint: bad Binance data, a broker error or a failed statement only
+        # rolls back that account's changes, and the others are still committed.
         for account in accounts:
             try:
-                stats = sync_account_positions_with_binance(account, db)
+                with db.begin_nested():
+                    stats = sync_account_positions_with_binance(account, db, commit=False)
                 total_stats["synced"] += stats["synced"]
                 total_stats["removed"] += stats["removed"]
                 total_stats["added"] += stats["added"]
@@ -150,6 +175,7 @@ def sync_all_active_accounts_positions() -> Dict[str, int]:
                 logger.error(f"Failed to sync positions for account {account.name}: {account_err}", exc_info=True)
                 # Continue with next account
                 continue
+        db.commit()
 
         logger.info(
             f"Position sync completed for all accounts: "
@@ -159,6 +185,7 @@ def sync_all_active_accounts_positions() -> Dict[str, int]:
         return total_stats
 
     except Exception as e:
+        db.rollback()
         logger.error(f"Failed to sync positions for all accounts: {e}", exc_info=True)
         return {"synced": 0, "removed": 0, "added": 0}
     finally:
@@ -6,7 +6,7 @@ import logging
 import time
 from collections import deque
 from threading import Lock
-from typing import Deque, Dict, List, Optional, Tuple
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +43,19 @@ class PriceCache:
             logger.debug("Cache expired for %s.%s", symbol, market)
             return None
 
+    def get_many(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], float]:
+        """Prices still within TTL for several (symbol, market) keys under a single lock; misses are omitted."""
+        current_time = time.time()
+        found: Dict[Tuple[str, str], float] = {}
+
+        with self.lock:
+            for key in keys:
+                entry = self.cache.get(key)
+                if entry and current_time - entry[1] < self.ttl_seconds:
+                    found[key] = entry[0]
+
+        return found
+
     def record(self, symbol: str, market: str, price: float, timestamp: Optional[float] = None) -> None:
         """Record price into short cache and long-term history."""
         key = (symbol, market)
@@ -120,6 +133,11 @@ def get_cached_price(symbol: str, market: str = "CRYPTO") -> Optional[float]:
     return price_cache.get(symbol, market)
 
 
+def get_cached_prices(pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], float]:
+    """Get every cached, unexpired price among (symbol, market) pairs in one pass."""
+    return price_cache.get_many(pairs)
+
+
 def cache_price(symbol: str, market: str, price: float) -> None:
     """Legacy API – record price with current timestamp."""
     price_cache.record(symbol, market, price)
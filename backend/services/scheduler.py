@@ -379,29 +379,25 @@ def reset_auto_trading_job():
 def start_asset_curve_broadcast():
     """Start asset curve broadcast task - broadcasts every 60 seconds"""
     # Dynamic import to avoid circular dependency (api.ws imports scheduler)
-    from api.ws import broadcast_asset_curve_update
+    from api.ws import broadcast_asset_curve_updates, get_all_asset_curves_data, manager
 
     def broadcast_all_timeframes():
         """Broadcast asset curve updates for all timeframes"""
-        try:
-            # Create event loop for async tasks
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            # Broadcast updates for all timeframes
-            loop.run_until_complete(broadcast_asset_curve_update("5m"))
-            loop.run_until_complete(broadcast_asset_curve_update("1h"))
-            loop.run_until_complete(broadcast_asset_curve_update("1d"))
-
-            logger.debug("Broadcasted asset curve updates for all timeframes")
+        if not manager.has_connections():
+            return
 
+        # Compute every timeframe with one session here, then hand the sends to the server's event loop
+        db: Session = SessionLocal()
+        try:
+            curves_by_timeframe = {tf: get_all_asset_curves_data(db, tf) for tf in ("5m", "1h", "1d")}
         except Exception as e:
-            logger.error(f"Failed to broadcast asset curve updates: {e}")
+            logger.error(f"Failed to build asset curve updates: {e}")
+            return
         finally:
-            try:
-                loop.close()
-            except Exception:
-                pass
+            db.close()
+
+        manager.schedule_task(broadcast_asset_curve_updates(curves_by_timeframe))
+        logger.debug("Broadcasted asset curve updates for all timeframes")
 
     try:
         # Ensure scheduler is running
@@ -18,8 +18,10 @@ from services.ai_decision_service import (
 )
 from services.asset_calculator import calc_positions_value
 from services.market_data import get_last_price
+from services.binance_sync import CACHE_TTL_SECONDS, RATE_LIMIT_INTERVAL_SECONDS  # noqa: F401 (re-exported)
 from services.broker_adapter import execute_order, get_balance_and_positions
 from services.order_matching import check_and_execute_order, create_order
+from services.overview_cache import invalidate_account_overview
 from sqlalchemy.orm import Session
 
 
@@ -32,9 +34,7 @@ SLIPPAGE_TOLERANCE = 0.95  # 5% slippage tolerance for trade verification
 MIN_CRYPTO_QUANTITY = Decimal("0.000001")  # Minimum crypto quantity
 POSITION_FULLY_SOLD_THRESHOLD = Decimal("0.000001")  # Threshold for considering position fully sold
 
-# Constants for API rate limiting and caching
-CACHE_TTL_SECONDS = 5.0  # Cache TTL for balance and positions (seconds)
-RATE_LIMIT_INTERVAL_SECONDS = 10.0  # Minimum interval between Binance API calls (seconds)
+# Constants for API rate limiting and caching (CACHE_TTL_SECONDS / RATE_LIMIT_INTERVAL_SECONDS live in binance_sync)
 POSITION_SYNC_THRESHOLD = 0.001  # Threshold for position quantity difference to trigger sync
 
 
@@ -580,6 +580,7 @@ def place_random_crypto_order(max_ratio: float = 0.2) -> None:
         )
 
         db.commit()
+        invalidate_account_overview(account.id)
         db.refresh(order)
 
         executed = check_and_execute_order(db, order)
@@ -165,6 +165,33 @@ class StrategyManager:
         finally:
             session.close()
 
+    def update_one(self, account: Account, cfg: AccountStrategyConfig) -> None:
+        """Apply a single account's strategy config to the in-memory states without reloading all accounts."""
+        if account.is_active != "true" or account.account_type != "AI":
+            with self._lock:
+                self._states.pop(account.id, None)
+            return
+
+        enabled = cfg.enabled == "true" and account.auto_trading_enabled == "true"
+        with self._lock:
+            existing_state = self._states.get(account.id)
+            # Update in place so running threads keep seeing the same state object
+            if existing_state:
+                existing_state.trigger_mode = cfg.trigger_mode or "realtime"
+                existing_state.interval_seconds = cfg.interval_seconds
+                existing_state.tick_batch_size = cfg.tick_batch_size
+                existing_state.enabled = enabled
+                existing_state.last_trigger_at = _as_aware(cfg.last_trigger_at)
+            else:
+                self._states[account.id] = StrategyState(
+                    account_id=account.id,
+                    trigger_mode=cfg.trigger_mode or "realtime",
+                    interval_seconds=cfg.interval_seconds,
+                    tick_batch_size=cfg.tick_batch_size,
+                    enabled=enabled,
+                    last_trigger_at=_as_aware(cfg.last_trigger_at),
+                )
+
     def handle_price_update(self, event: Dict[str, Any]) -> None:
 
         symbol = event.get("symbol", "UNKNOWN")
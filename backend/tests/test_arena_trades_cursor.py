@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.arena_routes import get_completed_trades
+from database.connection import Base
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.execute(text("INSERT INTO users (id, username, is_active) VALUES (1, 'default', 'true')"))
+    session.execute(
+        text(
+            "INSERT INTO accounts (id, user_id, version, name, account_type, is_active, auto_trading_enabled, model)"
+            " VALUES (1, 1, 'v1', 'Trader', 'AI', 'true', 'true', 'gpt-4')"
+        )
+    )
+    # Stored the way server_default=CURRENT_TIMESTAMP writes them: whole seconds, no microseconds
+    trade_times = ["2025-01-01 09:59:59", "2025-01-01 10:00:00", "2025-01-01 10:00:00", "2025-01-01 10:00:00"]
+    for trade_id, trade_time in enumerate(trade_times, start=1):
+        session.execute(
+            text(
+                "INSERT INTO trades (id, order_id, account_id, symbol, name, market, side, price, quantity,"
+                " commission, trade_time) VALUES (:id, 1, 1, 'BTC', 'Bitcoin', 'CRYPTO', 'BUY', 100, 1, 0, :time)"
+            ),
+            {"id": trade_id, "time": trade_time},
+        )
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _page_ids(db, limit):
+    ids, before = [], None
+    for _ in range(10):
+        page = get_completed_trades(limit=limit, account_id=None, before=before, db=db)
+        ids.extend(trade["trade_id"] for trade in page["trades"])
+        before = page["next_cursor"]
+        if before is None:
+            return ids
+    pytest.fail(f"pagination did not terminate: {ids}")
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_pages_across_trades_sharing_a_second(db, limit):
+    assert _page_ids(db, limit) == [4, 3, 2, 1]
+
+
+def test_bare_timestamp_cursor_skips_the_whole_second(db):
+    page = get_completed_trades(limit=10, account_id=None, before="2025-01-01T10:00:00", db=db)
+    assert [trade["trade_id"] for trade in page["trades"]] == [1]
@@ -0,0 +1,136 @@
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from api.account_routes import _build_close_matrix, _replay_trades
+
+BASE_TIME = datetime(2025, 1, 1)
+BAR_SECONDS = 3600
+NUM_BARS = 12
+SYMBOLS = [("BTC", "CRYPTO"), ("ETH", "CRYPTO")]
+
+
+def _trade(minutes: int, side: str, symbol: str, price: float, quantity: float, commission: float):
+    return SimpleNamespace(
+        trade_time=BASE_TIME + timedelta(minutes=minutes),
+        side=side,
+        symbol=symbol,
+        market="CRYPTO",
+        price=price,
+        quantity=quantity,
+        commission=commission,
+    )
+
+
+def _bar_timestamps(num_bars: int = NUM_BARS) -> list:
+    start = int(BASE_TIME.replace(tzinfo=timezone.utc).timestamp())
+    return [start + BAR_SECONDS * i for i in range(num_bars)]
+
+
+def _reference_replay(trades: list, timestamps: list, symbol_klines: dict):
+    """The per-bar loop the vectorized replay replaced (commission always deducted)."""
+    cash_changes, positions_values = [], []
+    for i, ts in enumerate(timestamps):
+        bar_time = datetime.fromtimestamp(ts, tz=timezone.utc)
+        cash_change = 0.0
+        quantities = {}
+        for trade in trades:
+            if trade.trade_time.replace(tzinfo=timezone.utc) > bar_time:
+                continue
+            notional = trade.price * trade.quantity
+            cash_change += (-notional if trade.side == "BUY" else notional) - trade.commission
+            key = (trade.symbol, trade.market)
+            quantities[key] = quantities.get(key, 0.0) + (trade.quantity if trade.side == "BUY" else -trade.quantity)
+
+        positions_value = 0.0
+        for key, quantity in quantities.items():
+            if quantity > 0 and key in symbol_klines and i < len(symbol_klines[key]):
+                close = symbol_klines[key][i]["close"]
+                if close:
+                    positions_value += close * quantity
+        cash_changes.append(cash_change)
+        positions_values.append(positions_value)
+    return cash_changes, positions_values
+
+
+def _run_replay(trades: list, timestamps: list, symbol_klines: dict):
+    keys = list(symbol_klines)
+    close_matrix = _build_close_matrix(symbol_klines, keys, len(timestamps))
+    symbol_index = {key: i for i, key in enumerate(keys)}
+    return _replay_trades(trades, np.array(timestamps, dtype=np.float64), symbol_index, close_matrix)
+
+
+FIXED_KLINES = {
+    ("BTC", "CRYPTO"): [{"close": 100.0 + i} for i in range(NUM_BARS)],
+    # Short history with gaps: missing and empty closes must not be valued
+    ("ETH", "CRYPTO"): [{"close": c} for c in (10.0, None, 12.0, 0, 14.0, 15.0, 16.0, 17.0, 18.0)],
+}
+
+FIXED_TRADES = [
+    _trade(-30, "BUY", "BTC", 99.0, 1.5, 0.2),  # before the first bar
+    _trade(0, "BUY", "ETH", 10.0, 4.0, 0.05),  # exactly on a bar
+    _trade(75, "SELL", "BTC", 101.5, 0.5, 0.1),
+    _trade(75, "BUY", "ETH", 11.0, 1.0, 0.01),  # same timestamp as the previous trade
+    _trade(200, "SELL", "ETH", 12.0, 6.0, 0.03),  # goes short; shorts are not valued
+    _trade(300, "BUY", "DOGE", 0.1, 100.0, 0.0),  # symbol without klines
+    _trade(10_000, "BUY", "BTC", 200.0, 1.0, 1.0),  # after the last bar
+]
+
+
+def test_replay_matches_reference_loop_on_fixed_trades():
+    timestamps = _bar_timestamps()
+    cash_change, positions_value = _run_replay(FIXED_TRADES, timestamps, FIXED_KLINES)
+    expected_cash, expected_positions = _reference_replay(FIXED_TRADES, timestamps, FIXED_KLINES)
+
+    np.testing.assert_allclose(cash_change, expected_cash, atol=1e-9)
+    np.testing.assert_allclose(positions_value, expected_positions, atol=1e-9)
+
+
+def test_replay_handles_unsorted_trades():
+    timestamps = _bar_timestamps()
+    shuffled = list(reversed(FIXED_TRADES))
+    cash_change, positions_value = _run_replay(shuffled, timestamps, FIXED_KLINES)
+    expected_cash, expected_positions = _reference_replay(shuffled, timestamps, FIXED_KLINES)
+
+    np.testing.assert_allclose(cash_change, expected_cash, atol=1e-9)
+    np.testing.assert_allclose(positions_value, expected_positions, atol=1e-9)
+
+
+def test_replay_without_trades_in_range_is_flat_zero():
+    timestamps = _bar_timestamps()
+    late_only = [_trade(10_000, "BUY", "BTC", 200.0, 1.0, 1.0)]
+    cash_change, positions_value = _run_replay(late_only, timestamps, FIXED_KLINES)
+
+    assert cash_change.tolist() == [0.0] * NUM_BARS
+    assert positions_value.tolist() == [0.0] * NUM_BARS
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_replay_matches_reference_loop_on_random_trades(seed):
+    rng = random.Random(seed)
+    timestamps = _bar_timestamps()
+    symbol_klines = {
+        key: [{"close": rng.choice([0, None, rng.uniform(1, 100)])} for _ in range(rng.randint(8, NUM_BARS))]
+        for key in SYMBOLS
+    }
+    trades = [
+        _trade(
+            rng.randint(-120, NUM_BARS * 60 + 120),
+            rng.choice(["BUY", "SELL"]),
+            rng.choice(["BTC", "ETH", "SOL"]),
+            rng.uniform(1, 100),
+            rng.uniform(0, 5),
+            rng.uniform(0, 1),
+        )
+        for _ in range(rng.randint(1, 30))
+    ]
+    trades.sort(key=lambda t: t.trade_time)
+
+    cash_change, positions_value = _run_replay(trades, timestamps, symbol_klines)
+    expected_cash, expected_positions = _reference_replay(trades, timestamps, symbol_klines)
+
+    np.testing.assert_allclose(cash_change, expected_cash, atol=1e-9)
+    np.testing.assert_allclose(positions_value, expected_positions, atol=1e-9)
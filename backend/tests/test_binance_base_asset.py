@@ -0,0 +1,24 @@
+import pytest
+
+from services.binance_sync import _base_asset, map_symbol_to_binance_pair
+
+
+@pytest.mark.parametrize(
+    "pair, expected",
+    [
+        ("BTCUSDT", "BTC"),
+        ("ETHBUSD", "ETH"),
+        # Only the trailing quote is stripped, not every occurrence
+        ("USDTBUSD", "USDT"),
+        ("BUSDUSDT", "BUSD"),
+        ("BTCETH", "BTCETH"),
+        ("USDT", ""),
+    ],
+)
+def test_base_asset_strips_only_quote_suffix(pair, expected):
+    assert _base_asset(pair) == expected
+
+
+def test_map_symbol_to_binance_pair():
+    assert map_symbol_to_binance_pair("btc") == "BTCUSDT"
+    assert map_symbol_to_binance_pair("ETH") == "ETHUSDT"
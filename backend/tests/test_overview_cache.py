@@ -0,0 +1,24 @@
+from services.overview_cache import (
+    cache_overview,
+    get_cached_overview,
+    invalidate_account_overview,
+    overview_generation,
+)
+
+
+def test_invalidate_drops_cached_overview():
+    cache_overview(101, ("balance", [], []), overview_generation(101))
+    assert get_cached_overview(101) == ("balance", [], [])
+
+    invalidate_account_overview(101)
+
+    assert get_cached_overview(101) is None
+
+
+def test_fetch_straddling_an_invalidation_is_not_cached():
+    generation = overview_generation(102)
+    invalidate_account_overview(102)  # e.g. an order committed while the broker fetch was in flight
+
+    cache_overview(102, ("stale", [], []), generation)
+
+    assert get_cached_overview(102) is None
@@ -0,0 +1,40 @@
+import asyncio
+
+from api.ws import _drain_batch
+
+
+def _split_batch(frame: bytes) -> list:
+    """Client-side decoding of a batched frame: 4-byte big-endian length, then the message."""
+    messages, offset = [], 0
+    while offset < len(frame):
+        length = int.from_bytes(frame[offset : offset + 4], "big")
+        offset += 4
+        messages.append(frame[offset : offset + length])
+        offset += length
+    return messages
+
+
+def test_drain_batch_round_trip():
+    queue = asyncio.Queue()
+    queue.put_nowait(b'{"type":"trade_update"}')
+    queue.put_nowait('{"type":"pong"}')  # text payloads are framed as UTF-8
+    queue.put_nowait(b"")
+
+    frame = _drain_batch(b'{"type":"snapshot"}', queue)
+
+    assert _split_batch(frame) == [b'{"type":"snapshot"}', b'{"type":"trade_update"}', b'{"type":"pong"}', b""]
+    assert queue.empty()
+
+
+def test_drain_batch_stops_at_size_limit():
+    from api.ws import BATCH_MAX_BYTES
+
+    queue = asyncio.Queue()
+    queue.put_nowait(b"second")
+    queue.put_nowait(b"third")
+    first = b"x" * BATCH_MAX_BYTES
+
+    frame = _drain_batch(first, queue)
+
+    assert _split_batch(frame) == [first]
+    assert queue.qsize() == 2
@@ -0,0 +1,36 @@
+from api.ws import _diff_snapshot
+
+
+def test_diff_snapshot_unchanged_is_empty():
+    snapshot = {"type": "snapshot", "overview": {"cash": 1.0}, "positions": [1, 2]}
+    assert _diff_snapshot(snapshot, dict(snapshot)) == []
+
+
+def test_diff_snapshot_top_level_and_nested_ops():
+    previous = {
+        "type": "snapshot",
+        "overview": {"cash": 1.0, "positions_value": 2.0, "stale": True},
+        "positions": [{"symbol": "BTC"}],
+        "kept": 1,
+    }
+    current = {
+        "type": "snapshot",
+        "overview": {"cash": 1.5, "positions_value": 2.0, "total_assets": 3.5},
+        "positions": [],
+        "orders": [],
+    }
+
+    ops = _diff_snapshot(previous, current)
+
+    assert sorted(ops, key=lambda op: op["path"]) == [
+        {"op": "add", "path": "/orders", "value": []},
+        {"op": "replace", "path": "/overview/cash", "value": 1.5},
+        {"op": "remove", "path": "/overview/stale"},
+        {"op": "add", "path": "/overview/total_assets", "value": 3.5},
+        {"op": "replace", "path": "/positions", "value": []},
+    ]
+
+
+def test_diff_snapshot_replaces_when_type_changes():
+    ops = _diff_snapshot({"overview": None}, {"overview": {"cash": 1.0}})
+    assert ops == [{"op": "replace", "path": "/overview", "value": {"cash": 1.0}}]